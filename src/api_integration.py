@@ -3,17 +3,26 @@ Real Job Data Integration Module
 Demonstrates how to fetch job data from Indeed, LinkedIn, and Glassdoor APIs.
 """
 
-import requests
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+
+from src.dedup import NearDuplicateIndex, drop_near_duplicates
+from src.http_cache import ResponseCache
+from src.market_sketches import MAX_SALARY_LPA, MarketSketch
+from src.parallel import parallel_apply
+from src.trend_store import TrendStore
 
 # Configuration for API keys (set via environment variables)
 INDEED_API_KEY = os.getenv("INDEED_API_KEY")
 LINKEDIN_API_KEY = os.getenv("LINKEDIN_API_KEY")
 GLASSDOOR_API_KEY = os.getenv("GLASSDOOR_API_KEY")
 
+# Shared on-disk response cache for the fetchers (see src/http_cache.py)
+HTTP_CACHE = ResponseCache()
+
 class JobDataCollector:
     """Fetch job data from multiple sources."""
     
@@ -39,7 +48,7 @@ class JobDataCollector:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = HTTP_CACHE.get(url, params=params, source="Indeed", exclude_params=("publisher",))
             response.raise_for_status()
             data = response.json()
             
@@ -83,7 +92,7 @@ class JobDataCollector:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = HTTP_CACHE.get(url, params=params, headers=headers, source="LinkedIn")
             response.raise_for_status()
             data = response.json()
             
@@ -117,9 +126,21 @@ class JobDataCollector:
         return []
     
     @staticmethod
-    def collect_all_jobs(keywords: str, location: str = "India") -> pd.DataFrame:
-        """Aggregate job data from all sources."""
+    def collect_all_jobs(keywords: str, location: str = "India",
+                         sketch: Optional[MarketSketch] = None,
+                         trends: Optional[TrendStore] = None,
+                         dedup: Optional[NearDuplicateIndex] = None) -> pd.DataFrame:
+        """
+        Aggregate job data from all sources, stamped with `collected_at` (UTC).
+
+        Near-duplicate postings (the same job syndicated across portals or
+        reposted with small edits) are dropped; pass a persistent `dedup` index
+        to also drop postings seen in earlier runs. The remaining batch is
+        folded into `sketch` and appended to the day partitions of `trends`
+        when they are given.
+        """
         all_jobs = []
+        collected_at = datetime.now(timezone.utc).isoformat()
         
         print(f"\n📊 Collecting job data for: {keywords} in {location}")
         print("=" * 60)
@@ -138,8 +159,23 @@ class JobDataCollector:
         
         print("=" * 60)
         print(f"\n✓ Total jobs collected: {len(all_jobs)}")
+        for source, stats in HTTP_CACHE.stats().items():
+            if not source.startswith("_"):
+                print(f"   HTTP cache {source}: {stats['hits']} fresh, {stats['revalidated']} revalidated, "
+                      f"{stats['misses']} fetched ({stats['hit_ratio']:.0%} hit ratio)")
         
-        return pd.DataFrame(all_jobs) if all_jobs else pd.DataFrame()
+        jobs_df = pd.DataFrame(all_jobs) if all_jobs else pd.DataFrame()
+        if not jobs_df.empty:
+            jobs_df["collected_at"] = collected_at
+            jobs_df, duplicates = drop_near_duplicates(jobs_df, dedup, key_prefix=f"{collected_at}/")
+            print(f"✓ Dropped {len(duplicates)} near-duplicate postings, {len(jobs_df)} unique")
+        if (sketch is not None or trends is not None) and not jobs_df.empty:
+            records = to_market_records(jobs_df)
+            if sketch is not None:
+                sketch.update(records)
+            if trends is not None:
+                trends.append(records)
+        return jobs_df
 
 def extract_skills_from_description(description: str) -> str:
     """
@@ -164,6 +200,50 @@ def extract_skills_from_description(description: str) -> str:
     
     return ", ".join(found_skills) if found_skills else ""
 
+def extract_skills_from_descriptions(descriptions, workers: int = 1) -> List[str]:
+    """Run `extract_skills_from_description` over many descriptions, optionally across processes."""
+    return parallel_apply(extract_skills_from_description, descriptions, workers)
+
+def parse_posted_salary(salary: str) -> Optional[float]:
+    """
+    Salary text from a job portal in LPA, or None if it can't be read reliably.
+
+    Handles "5-8 LPA" / "5 - 8 lakhs" as well as rupee amounts such as
+    "₹5,00,000 - ₹8,00,000 a year" or "₹40,000 a month". Hourly, daily and
+    weekly rates, and amounts without a unit, are not annualised.
+    """
+    text = salary.lower().replace(",", "")
+    numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", text)]
+    if not numbers:
+        return None
+    value = sum(numbers[:2]) / len(numbers[:2])
+    if "lpa" in text or "lakh" in text or "lac" in text:
+        lpa = value
+    elif value >= 1000:
+        if any(period in text for period in ("hour", "day", "week")):
+            return None
+        lpa = value * (12 if "month" in text else 1) / 100_000
+    else:
+        return None
+    return lpa if 0.5 <= lpa < MAX_SALARY_LPA else None
+
+def to_market_records(jobs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Map collected postings onto the cleaned_jobs.csv columns used for market statistics.
+
+    Fields the portals don't provide (experience, certifications) and salaries
+    that can't be parsed are left missing, so sketches skip them instead of
+    recording placeholder values.
+    """
+    return pd.DataFrame({
+        "title": jobs["title"],
+        "skills": extract_skills_from_descriptions(jobs["skills"].fillna("").astype(str)),
+        "experience": jobs["experience"] if "experience" in jobs else None,
+        "salary_lpa": [parse_posted_salary(s) for s in jobs["salary"].fillna("").astype(str)],
+        "certifications": None,
+        "collected_at": jobs["collected_at"] if "collected_at" in jobs else datetime.now(timezone.utc).isoformat(),
+    })
+
 if __name__ == "__main__":
     # Example: Collect data analyst jobs
     print("\n" + "=" * 60)
@@ -187,6 +267,8 @@ if __name__ == "__main__":
     print("-" * 60)
     
     # Simulate collection (will show warnings if keys not set)
-    # df = JobDataCollector.collect_all_jobs("Data Analyst", "India")
+    # sketch = MarketSketch.load() if os.path.exists("outputs/market_sketch.bin") else MarketSketch()
+    # df = JobDataCollector.collect_all_jobs("Data Analyst", "India", sketch=sketch, trends=TrendStore())
     # if not df.empty:
     #     df.to_csv("data/collected_jobs.csv", index=False)
+    #     sketch.save()
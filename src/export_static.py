@@ -0,0 +1,289 @@
+"""
+Prerender the Role Lookup page as static files for CDN serving.
+
+Every role x experience combination is rendered with the same summary and
+figure code the dashboard uses (views.data.build_role_summary and the
+views.role_lookup figure builders) and written to
+
+    site/
+        index.html
+        manifest.json
+        roles/<role>/<experience>.html
+        roles/<role>/<experience>.json
+
+Path segments are slugs of the role and experience names; names that slug to
+the same segment (e.g. "C++ Developer" and "C Developer") get a short hash of
+the name appended so their pages don't overwrite each other.
+
+Each figure is serialized to JSON once and embedded in both files. Roles are
+rendered in parallel across processes. manifest.json records the sha256 of the
+input CSV, and a run whose data hash matches the manifest is a no-op unless
+--force is given.
+
+Examples:
+    python -m src.export_static
+    python -m src.export_static --data data/cleaned_jobs.csv --out site --workers 4
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.instrumentation import span
+
+DEFAULT_OUT_DIR = "site"
+MANIFEST_NAME = "manifest.json"
+PLOTLY_CDN = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+
+_df: Optional[pd.DataFrame] = None
+
+
+def slugify(text: str) -> str:
+    """URL-safe path segment, e.g. '5+ years' -> '5-years'."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "all"
+
+
+def unique_slugs(names: List[str]) -> Dict[str, str]:
+    """Slug per name; names sharing a slug get the first 8 hex digits of their sha1 appended."""
+    slugs = {name: slugify(name) for name in names}
+    taken = Counter(slugs.values())
+    return {
+        name: slug if taken[slug] == 1 else f"{slug}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+        for name, slug in slugs.items()
+    }
+
+
+def data_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(out_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _to_python(value):
+    """numpy scalars -> plain Python for json.dumps."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def page_payload(role: str, experience: str, summary: Dict) -> Dict:
+    """JSON-ready page content; figures are serialized here, once."""
+    from views.common import ROLE_TO_COMPANIES, portal_search_links
+    from views.role_lookup import experience_figure, skills_figure
+
+    return {
+        "role": role,
+        "experience": experience,
+        "avg_salary": _to_python(summary["avg_salary"]),
+        "min_salary": _to_python(summary["min_salary"]),
+        "max_salary": _to_python(summary["max_salary"]),
+        "median_salary": _to_python(summary["median_salary"]),
+        "total_records": summary["total_records"],
+        "top_skills": summary["top_skills"],
+        "certifications": summary["certifications"][:8],
+        "companies": ROLE_TO_COMPANIES.get(role, ["Glassdoor", "LinkedIn", "Indeed"])[:6],
+        "search_links": portal_search_links(role),
+        "sample_records": json.loads(summary["sample_records"].to_json(orient="records")),
+        "figures": {
+            "skills": skills_figure(summary).to_json(),
+            "experience": experience_figure(summary).to_json(),
+        },
+    }
+
+
+def render_html(page: Dict) -> str:
+    esc = html.escape
+    metrics = "".join(
+        f'<div class="metric"><span>{label}</span><b>{value}</b></div>'
+        for label, value in [
+            ("Average", f"₹{page['avg_salary']:.2f}L"),
+            ("Median", f"₹{page['median_salary']:.2f}L"),
+            ("Min Salary", f"₹{page['min_salary']:.2f}L"),
+            ("Max Salary", f"₹{page['max_salary']:.2f}L"),
+            ("Records", page["total_records"]),
+        ]
+    )
+    certs = "".join(f"<li>{esc(c)}</li>" for c in page["certifications"]) or \
+        "<li>No specific certifications found for this role</li>"
+    links = " · ".join(f'<a href="{esc(url)}">{esc(label)}</a>' for label, url in page["search_links"])
+    records = pd.DataFrame(page["sample_records"]).to_html(index=False, border=0)
+    figures = "".join(
+        f'<div id="fig-{name}"></div><script>(function(f){{Plotly.newPlot("fig-{name}",f.data,f.layout,'
+        f'{{responsive:true}});}})({fig_json});</script>'
+        for name, fig_json in page["figures"].items()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{esc(page['role'])} ({esc(page['experience'])}) - Career Compass</title>
+<script src="{PLOTLY_CDN}"></script>
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 2rem auto; padding: 0 1rem; }}
+.metrics {{ display: flex; gap: 1rem; flex-wrap: wrap; }}
+.metric {{ background: #f0f2f6; border-radius: 8px; padding: 0.75rem 1rem; }}
+.metric span {{ display: block; font-size: 0.8rem; color: #555; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 0.85rem; }}
+td, th {{ border-bottom: 1px solid #ddd; padding: 0.3rem; text-align: left; }}
+</style>
+</head>
+<body>
+<p><a href="../../index.html">All roles</a></p>
+<h1>{esc(page['role'])}</h1>
+<p>Experience: {esc(page['experience'])}</p>
+<div class="metrics">{metrics}</div>
+{figures}
+<h2>Recommended Certifications</h2>
+<ul>{certs}</ul>
+<h2>Companies Hiring for This Role</h2>
+<p>{esc(', '.join(page['companies']))} and many more!</p>
+<p>{links}</p>
+<h2>Sample Job Records</h2>
+{records}
+</body>
+</html>
+"""
+
+
+def _quiet_streamlit():
+    # The views modules declare st.cache_data helpers, and outside `streamlit run`
+    # each one logs a "No runtime found" warning when it is created or called
+    import streamlit.logger
+
+    streamlit.logger.set_log_level("error")
+
+
+def _init_worker(data_path: str):
+    global _df
+    _quiet_streamlit()
+    _df = pd.read_csv(data_path)
+
+
+def export_role(role: str, role_slug: str, experiences: Dict[str, str], out_dir: str) -> List[Dict]:
+    """Write the pages for one role; `experiences` maps each level to its slug. Returns manifest entries."""
+    from views.data import build_role_summary
+
+    role_dir = os.path.join(out_dir, "roles", role_slug)
+    os.makedirs(role_dir, exist_ok=True)
+    entries = []
+    for experience, experience_slug in experiences.items():
+        summary = build_role_summary(_df, role, experience)
+        if summary is None:
+            continue
+        with span("export_static.page"):
+            page = page_payload(role, experience, summary)
+            base = os.path.join(role_dir, experience_slug)
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump(page, f, ensure_ascii=False)
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(render_html(page))
+        entries.append({
+            "role": role,
+            "experience": experience,
+            "path": os.path.relpath(base, out_dir).replace(os.sep, "/"),
+        })
+    return entries
+
+
+def render_index(pages: List[Dict]) -> str:
+    by_role: Dict[str, List[Dict]] = {}
+    for entry in pages:
+        by_role.setdefault(entry["role"], []).append(entry)
+    items = "".join(
+        f"<li>{html.escape(role)}: " + " · ".join(
+            f'<a href="{html.escape(e["path"])}.html">{html.escape(e["experience"])}</a>' for e in entries
+        ) + "</li>"
+        for role, entries in sorted(by_role.items())
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8">'
+        "<title>Career Compass - Roles</title></head>\n"
+        f"<body><h1>Career Compass - Roles</h1><ul>{items}</ul></body>\n</html>\n"
+    )
+
+
+def export_site(data_path: str, out_dir: str = DEFAULT_OUT_DIR, workers: int = 1,
+                force: bool = False) -> Optional[Dict]:
+    """Render all pages; returns the new manifest, or None if the export is already current."""
+    digest = data_hash(data_path)
+    previous = read_manifest(out_dir)
+    if not force and previous and previous.get("data_sha256") == digest:
+        return None
+
+    _init_worker(data_path)
+    roles = sorted(_df["title"].unique().tolist())
+    experiences = unique_slugs(["All"] + sorted(_df["experience"].unique().tolist()))
+    role_slugs = unique_slugs(roles)
+
+    # Stale pages from roles that no longer exist would otherwise linger
+    shutil.rmtree(os.path.join(out_dir, "roles"), ignore_errors=True)
+    os.makedirs(out_dir, exist_ok=True)
+
+    pages: List[Dict] = []
+    if workers <= 1:
+        for role in roles:
+            pages.extend(export_role(role, role_slugs[role], experiences, out_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data_path,)) as pool:
+            for entries in pool.map(export_role, roles, [role_slugs[r] for r in roles],
+                                    [experiences] * len(roles), [out_dir] * len(roles)):
+                pages.extend(entries)
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(render_index(pages))
+
+    manifest = {
+        "data_path": data_path,
+        "data_sha256": digest,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "pages": pages,
+    }
+    # Written last, so an interrupted export is redone on the next run
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def main(argv=None):
+    _quiet_streamlit()
+    from views.data import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Export static Role Lookup pages.")
+    parser.add_argument("--data", default=DATA_PATH, help="Cleaned jobs CSV")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Output directory")
+    parser.add_argument("--workers", type=int, default=1, help="Rendering processes (0 = all cores)")
+    parser.add_argument("--force", action="store_true", help="Re-export even if the data hash is unchanged")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest = export_site(args.data, args.out, args.workers or os.cpu_count(), args.force)
+    if manifest is None:
+        print(f"✓ {args.out} is up to date with {args.data}")
+        return
+    print(f"✓ Exported {len(manifest['pages'])} pages to {args.out} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
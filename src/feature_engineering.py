@@ -1,14 +1,189 @@
+import argparse
+import glob
+import json
+import os
+from functools import partial
+
 from sklearn.preprocessing import MultiLabelBinarizer
+import numpy as np
 import pandas as pd
+from scipy import sparse
+
+from src.instrumentation import span
+from src.parallel import (
+    MIN_PARALLEL_ROWS,
+    SharedStrings,
+    collect_vocabulary,
+    default_workers,
+    map_partitions,
+    worker_pool,
+)
+
+CLEANED_PATH = "data/cleaned_jobs.csv"
+MODEL_DATA_PATH = "data/model_data.csv"
+SHARD_DIR = "data/model_data_shards"
+
+
+def split_skills(skills):
+    """Tokenize a comma-separated skills string the way the model features expect."""
+    return skills.lower().split(",")
+
+
+def build_features(df, workers=1):
+    """In-memory path: binary skill columns plus salary_lpa."""
+    workers = workers or default_workers()
+    if workers > 1 and len(df) >= MIN_PARALLEL_ROWS:
+        # Tokenize and encode inside the workers so that only vocabulary sets
+        # and CSR index arrays come back, never per-row token lists.
+        with worker_pool(workers) as pool, SharedStrings(df["skills"]) as skills:
+            with span("feature_engineering.tokenize_skills"):
+                vocabulary = sorted(collect_vocabulary(split_skills, skills, workers, pool))
+            with span("feature_engineering.binarize"):
+                matrix = encode_skills(skills, vocabulary, workers, pool)
+                skills_df = pd.DataFrame(matrix.toarray().astype(np.int64), columns=vocabulary)
+        return pd.concat([skills_df, df["salary_lpa"].reset_index(drop=True)], axis=1)
+
+    with span("feature_engineering.tokenize_skills"):
+        df["skills_list"] = df["skills"].apply(split_skills)
+
+    with span("feature_engineering.binarize"):
+        mlb = MultiLabelBinarizer()
+        skill_features = mlb.fit_transform(df["skills_list"])
+
+        skills_df = pd.DataFrame(skill_features, columns=mlb.classes_)
+        return pd.concat([skills_df, df["salary_lpa"].reset_index(drop=True)], axis=1)
+
+
+def build_vocabulary(path, chunksize, workers=1, pool=None):
+    """First pass: collect the sorted skill vocabulary without holding the file in memory."""
+    vocabulary = set()
+    for chunk in pd.read_csv(path, usecols=["skills"], chunksize=chunksize):
+        with span("feature_engineering.tokenize_skills"):
+            vocabulary |= collect_vocabulary(split_skills, chunk["skills"], workers, pool)
+    return sorted(vocabulary)
+
+
+def encode_chunk(skills, vocabulary_index):
+    """Encode a chunk of skills strings as a CSR matrix over the shared vocabulary."""
+    indptr = [0]
+    indices = []
+    for value in skills:
+        indices.extend(sorted({vocabulary_index[s] for s in split_skills(value)}))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.uint8)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary_index)),
+    )
+
+
+def encode_skills(skills, vocabulary, workers=1, pool=None):
+    """CSR encoding of skills strings (a list or SharedStrings), one partition per task."""
+    vocabulary_index = {skill: i for i, skill in enumerate(vocabulary)}
+    return sparse.vstack(
+        map_partitions(partial(encode_chunk, vocabulary_index=vocabulary_index), skills, workers, pool),
+        format="csr",
+    )
+
+
+def build_features_chunked(path=CLEANED_PATH, output_path=MODEL_DATA_PATH,
+                           shard_dir=SHARD_DIR, chunksize=100_000, workers=1):
+    """
+    Out-of-core path: peak memory is bounded by `chunksize` rows.
+
+    Pass one builds the vocabulary, pass two encodes each chunk as a sparse
+    shard (`part-NNNNN.npz` with the matching `salary_lpa`) and appends the
+    dense rows to `output_path` so train_model.py reads the same CSV as before.
+    """
+    # One pool for both passes and every chunk
+    with worker_pool(workers) as pool:
+        vocabulary = build_vocabulary(path, chunksize, workers, pool)
+
+        os.makedirs(shard_dir, exist_ok=True)
+        for old_shard in glob.glob(os.path.join(shard_dir, "part-*.npz")):
+            os.remove(old_shard)
+        with open(os.path.join(shard_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump(vocabulary, f)
+
+        for i, chunk in enumerate(pd.read_csv(path, usecols=["skills", "salary_lpa"], chunksize=chunksize)):
+            with span("feature_engineering.binarize"):
+                matrix = encode_skills(chunk["skills"], vocabulary, workers, pool)
+                salary = chunk["salary_lpa"].to_numpy()
+
+            with span("feature_engineering.write_shard"):
+                np.savez_compressed(
+                    os.path.join(shard_dir, f"part-{i:05d}.npz"),
+                    indices=matrix.indices, indptr=matrix.indptr, salary_lpa=salary,
+                )
+
+            with span("feature_engineering.write_csv"):
+                dense = pd.DataFrame(matrix.toarray().astype(np.int64), columns=vocabulary)
+                dense["salary_lpa"] = salary
+                dense.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+        return vocabulary
+
+
+def load_shards(shard_dir=SHARD_DIR):
+    """Load all shards as (CSR feature matrix, salary array, vocabulary)."""
+    with open(os.path.join(shard_dir, "vocabulary.json"), encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    matrices, salaries = [], []
+    for shard_path in sorted(glob.glob(os.path.join(shard_dir, "part-*.npz"))):
+        with np.load(shard_path) as shard:
+            n_rows = len(shard["indptr"]) - 1
+            data = np.ones(len(shard["indices"]), dtype=np.uint8)
+            matrices.append(sparse.csr_matrix(
+                (data, shard["indices"], shard["indptr"]), shape=(n_rows, len(vocabulary))
+            ))
+            salaries.append(shard["salary_lpa"])
+    if not matrices:
+        return sparse.csr_matrix((0, len(vocabulary)), dtype=np.uint8), np.empty(0), vocabulary
+    return sparse.vstack(matrices, format="csr"), np.concatenate(salaries), vocabulary
+
+
+def verify_parity(path=CLEANED_PATH, shard_dir=SHARD_DIR):
+    """
+    Check the chunked shards row-for-row against the in-memory path.
+
+    This loads `path` fully, so run it on a sample that fits in memory.
+    """
+    expected = build_features(pd.read_csv(path))
+    matrix, salary, vocabulary = load_shards(shard_dir)
+
+    if list(expected.columns[:-1]) != vocabulary:
+        raise AssertionError("Vocabulary differs between in-memory and chunked paths")
+    if not np.array_equal(expected.drop(columns="salary_lpa").to_numpy(), matrix.toarray()):
+        raise AssertionError("Skill features differ between in-memory and chunked paths")
+    if not np.allclose(expected["salary_lpa"].to_numpy(), salary, equal_nan=True):
+        raise AssertionError("salary_lpa differs between in-memory and chunked paths")
+    return len(expected)
+
+
+def main(chunksize=None, verify=False, workers=1):
+    if chunksize is None:
+        with span("feature_engineering.read_csv"):
+            df = pd.read_csv(CLEANED_PATH)
 
-df = pd.read_csv("data/cleaned_jobs.csv")
+        final_df = build_features(df, workers)
 
-df["skills_list"] = df["skills"].apply(lambda x: x.lower().split(","))
+        with span("feature_engineering.write_csv"):
+            final_df.to_csv(MODEL_DATA_PATH, index=False)
+        return
 
-mlb = MultiLabelBinarizer()
-skill_features = mlb.fit_transform(df["skills_list"])
+    build_features_chunked(chunksize=chunksize, workers=workers)
+    if verify:
+        rows = verify_parity()
+        print(f"✓ Chunked output matches the in-memory path ({rows} rows)")
 
-skills_df = pd.DataFrame(skill_features, columns=mlb.classes_)
-final_df = pd.concat([skills_df, df["salary_lpa"]], axis=1)
 
-final_df.to_csv("data/model_data.csv", index=False)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert skills to binary model features.")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the input in chunks of this many rows and write sparse shards")
+    parser.add_argument("--verify", action="store_true",
+                        help="After a chunked run, compare it row-for-row with the in-memory path")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for tokenization and encoding (0 = all cores)")
+    args = parser.parse_args()
+    main(chunksize=args.chunksize, verify=args.verify, workers=args.workers or None)
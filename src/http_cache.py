@@ -0,0 +1,298 @@
+"""
+Persistent HTTP response cache for the job source fetchers.
+
+Responses are keyed by the normalised URL plus query parameters (scheme and
+host lower-cased, default ports dropped, parameters sorted). Credentials passed
+as parameters, such as Indeed's `publisher` key, are left out of the key with
+`exclude_params` and never written to disk.
+
+An entry younger than its source's TTL is served without a request. Once it
+is stale, the cache revalidates it with If-None-Match / If-Modified-Since when
+the server sent an ETag or Last-Modified, so an unchanged result page costs a
+bodiless 304. Otherwise it is fetched again.
+
+Bodies are stored gzip-compressed under `<cache dir>/bodies/`, indexed by a
+SQLite file. The least recently used entries are evicted once the bodies
+exceed `max_bytes`. Hit, revalidation and miss counts are available from
+`stats()` and, with metrics enabled, as `cache_*{name="http_<source>"}`.
+
+Configuration:
+    CAREER_COMPASS_HTTP_CACHE=data/http_cache   # cache directory, or "off"
+    CAREER_COMPASS_HTTP_CACHE_MB=256            # size bound for stored bodies
+    CAREER_COMPASS_HTTP_CACHE_TTL=3600          # default TTL in seconds
+    CAREER_COMPASS_HTTP_CACHE_TTL_INDEED=900    # TTL for one source (any source name,
+                                                # case-insensitive), overrides the default
+
+Examples:
+    python -m src.http_cache stats
+    python -m src.http_cache clear
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.instrumentation import incr, span
+
+DEFAULT_CACHE_DIR = os.getenv("CAREER_COMPASS_HTTP_CACHE", "data/http_cache")
+DEFAULT_MAX_BYTES = int(float(os.getenv("CAREER_COMPASS_HTTP_CACHE_MB", "256")) * 2**20)
+DEFAULT_TTL = float(os.getenv("CAREER_COMPASS_HTTP_CACHE_TTL", "3600"))
+SOURCE_TTL_PREFIX = "CAREER_COMPASS_HTTP_CACHE_TTL_"
+# Headers worth replaying from a cached response
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str, params: Optional[Dict] = None, exclude_params: Iterable[str] = ()) -> str:
+    """Canonical form of `url` + `params` used as the cache key."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for name, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((name, str(v)) for v in values if v is not None)
+    excluded = set(exclude_params)
+    query = sorted((k, v) for k, v in query if k not in excluded)
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def source_ttls_from_env(environ: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """Per-source TTLs from CAREER_COMPASS_HTTP_CACHE_TTL_<SOURCE> variables, keyed by lower-cased source."""
+    environ = os.environ if environ is None else environ
+    return {
+        name[len(SOURCE_TTL_PREFIX):].lower(): float(value)
+        for name, value in environ.items()
+        if name.startswith(SOURCE_TTL_PREFIX) and value
+    }
+
+
+class ResponseCache:
+    """
+    On-disk cache in front of `requests.get` with conditional revalidation.
+
+    `ttls` maps source names to TTLs in seconds; they override the per-source
+    environment variables, which override `default_ttl`.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 session: Optional[requests.Session] = None):
+        self.enabled = cache_dir.lower() != "off"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = source_ttls_from_env()
+        self.ttls.update((source.lower(), ttl) for source, ttl in (ttls or {}).items())
+        self.default_ttl = default_ttl
+        self.session = session or requests.Session()
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        # source -> {"hits": n, "revalidated": n, "misses": n}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    # --- storage --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so that importing the collector has no side effects
+        if self._db is None:
+            os.makedirs(os.path.join(self.cache_dir, "bodies"), exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"),
+                                       timeout=5, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, source TEXT, status INTEGER, headers TEXT, "
+                "etag TEXT, last_modified TEXT, fetched REAL, accessed REAL, size INTEGER)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "bodies", key[:2], key + ".gz")
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._body_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key: str, url: str, source: str, response: requests.Response, now: float):
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        headers = {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers}
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, source, response.status_code, json.dumps(headers),
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now, now, os.path.getsize(path)),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    # --- requests -------------------------------------------------------
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source.lower(), self.default_ttl)
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            source: str = "default", exclude_params: Iterable[str] = (), timeout: float = 30) -> requests.Response:
+        """`requests.get` through the cache; cached responses have `from_cache = True`."""
+        if not self.enabled:
+            return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+        canonical = normalize_url(url, params, exclude_params)
+        key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status, headers, etag, last_modified, fetched FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        body = self._read_body(key) if row is not None else None
+
+        with span(f"http_cache.{source}"):
+            if body is not None and now - row[4] < self.ttl(source):
+                self._touch(key, now)
+                self._record(source, "hits")
+                return self._cached_response(canonical, row, body)
+
+            request_headers = dict(headers or {})
+            if body is not None:
+                if row[2]:
+                    request_headers["If-None-Match"] = row[2]
+                if row[3]:
+                    request_headers["If-Modified-Since"] = row[3]
+            response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+            if response.status_code == 304 and body is not None:
+                row = self._revalidated(key, row, response, now)
+                self._record(source, "revalidated")
+                return self._cached_response(canonical, row, body)
+
+            self._record(source, "misses")
+            if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+                self._store(key, canonical, source, response, now)
+            return response
+
+    def _touch(self, key: str, now: float):
+        with self._lock:
+            db = self._connect()
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            db.commit()
+
+    def _revalidated(self, key: str, row, response: requests.Response, now: float):
+        """Restart the entry's TTL and take the validators the 304 sent; returns the updated row."""
+        headers = json.loads(row[1])
+        headers.update({h: response.headers[h] for h in KEPT_HEADERS if h in response.headers})
+        etag = response.headers.get("ETag", row[2])
+        last_modified = response.headers.get("Last-Modified", row[3])
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, fetched = ?, accessed = ? "
+                "WHERE key = ?",
+                (json.dumps(headers), etag, last_modified, now, now, key),
+            )
+            db.commit()
+        return (row[0], json.dumps(headers), etag, last_modified, now)
+
+    @staticmethod
+    def _cached_response(url: str, row, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = row[0]
+        response.headers = CaseInsensitiveDict(json.loads(row[1]))
+        response._content = body
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.from_cache = True
+        return response
+
+    def _record(self, source: str, outcome: str):
+        with self._lock:
+            stats = self._stats.setdefault(source, {"hits": 0, "revalidated": 0, "misses": 0})
+            stats[outcome] += 1
+        # Revalidated responses count as hits: their body wasn't downloaded again
+        incr("cache_requests_total", f"http_{source}")
+        if outcome == "misses":
+            incr("cache_misses_total", f"http_{source}")
+
+    # --- maintenance ----------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-source request outcomes for this process, plus what is stored on disk."""
+        with self._lock:
+            report = {}
+            for source, stats in self._stats.items():
+                total = sum(stats.values())
+                report[source] = dict(stats, hit_ratio=(stats["hits"] + stats["revalidated"]) / total)
+            if self.enabled:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+                report["_disk"] = {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+            return report
+
+    def clear(self, source: Optional[str] = None):
+        """Drop all entries, or only those of `source`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            db = self._connect()
+            query, args = ("SELECT key FROM responses", ()) if source is None else \
+                ("SELECT key FROM responses WHERE source = ?", (source,))
+            for (key,) in db.execute(query, args).fetchall():
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                try:
+                    os.remove(self._body_path(key))
+                except OSError:
+                    pass
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the HTTP response cache.")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries and bytes stored")
+    clear = sub.add_parser("clear", help="Delete cached responses")
+    clear.add_argument("--source", help="Only this source, e.g. Indeed")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.dir)
+    if args.command == "stats":
+        disk = cache.stats()["_disk"]
+        print(f"{disk['entries']} responses, {disk['bytes'] / 2**20:.2f} MB of {disk['max_bytes'] / 2**20:.0f} MB")
+    else:
+        cache.clear(args.source)
+        print(f"✓ Cleared {args.source or 'all'} cached responses in {args.dir}")
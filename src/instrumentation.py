@@ -0,0 +1,241 @@
+"""
+Opt-in instrumentation for the dashboard, the prediction path and the pipeline scripts.
+
+Disabled by default. Enable it with environment variables:
+
+    CAREER_COMPASS_METRICS=1              # turn timers, spans and counters on
+    CAREER_COMPASS_METRICS_FILE=out.prom  # write metrics on exit (.json => JSON, else Prometheus text)
+    CAREER_COMPASS_METRICS_PORT=9464      # serve /metrics and /metrics.json from the dashboard
+
+When disabled, `timed` returns the function untouched, `span` returns a shared
+no-op context manager and `cached` applies the cache decorator directly, so the
+instrumented code paths cost one attribute lookup at most.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+ENABLED = os.getenv("CAREER_COMPASS_METRICS", "").lower() in ("1", "true", "yes", "on")
+METRICS_FILE = os.getenv("CAREER_COMPASS_METRICS_FILE")
+METRICS_PORT = os.getenv("CAREER_COMPASS_METRICS_PORT")
+
+_NULL_SPAN = nullcontext()
+
+
+class MetricsRegistry:
+    """Thread-safe store of span timings and labelled counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> [count, total_seconds, max_seconds]
+        self._timers: Dict[str, list] = {}
+        # (metric, label) -> value
+        self._counters: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+
+    def incr(self, metric: str, label: str = "", amount: float = 1):
+        key = (metric, label)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """Return a JSON-serialisable copy of all metrics, including cache hit ratios."""
+        with self._lock:
+            timers = {
+                name: {"count": c, "total_seconds": t, "max_seconds": m, "mean_seconds": t / c}
+                for name, (c, t, m) in self._timers.items()
+            }
+            counters = {}
+            for (metric, label), value in self._counters.items():
+                counters.setdefault(metric, {})[label] = value
+
+        caches = {}
+        requests = counters.get("cache_requests_total", {})
+        misses = counters.get("cache_misses_total", {})
+        for name, total in requests.items():
+            miss = misses.get(name, 0)
+            caches[name] = {
+                "requests": total,
+                "misses": miss,
+                "hits": total - miss,
+                "hit_ratio": (total - miss) / total if total else 0.0,
+            }
+        return {"timers": timers, "counters": counters, "caches": caches}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = [
+            "# TYPE career_compass_span_seconds summary",
+        ]
+        for name, stats in sorted(snap["timers"].items()):
+            lines.append(f'career_compass_span_seconds_count{{span="{name}"}} {stats["count"]}')
+            lines.append(f'career_compass_span_seconds_sum{{span="{name}"}} {stats["total_seconds"]:.6f}')
+        lines.append("# TYPE career_compass_span_seconds_max gauge")
+        for name, stats in sorted(snap["timers"].items()):
+            lines.append(f'career_compass_span_seconds_max{{span="{name}"}} {stats["max_seconds"]:.6f}')
+        for metric, values in sorted(snap["counters"].items()):
+            lines.append(f"# TYPE career_compass_{metric} counter")
+            for label, value in sorted(values.items()):
+                labels = f'{{name="{label}"}}' if label else ""
+                lines.append(f"career_compass_{metric}{labels} {value:g}")
+        lines.append("# TYPE career_compass_cache_hit_ratio gauge")
+        for name, stats in sorted(snap["caches"].items()):
+            lines.append(f'career_compass_cache_hit_ratio{{name="{name}"}} {stats["hit_ratio"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name: str):
+    """Context manager timing a block under `name` (a no-op when disabled)."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator timing every call of the function under `name`."""
+    def decorator(func):
+        if not ENABLED:
+            return func
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def incr(metric: str, label: str = "", amount: float = 1):
+    """Increment a labelled counter (a no-op when disabled)."""
+    if ENABLED:
+        REGISTRY.incr(metric, label, amount)
+
+
+def cached(name: str, cache_decorator):
+    """
+    Apply a caching decorator such as `st.cache_data` and record its hit rate.
+
+    Every call counts as a lookup; only calls that reach the wrapped function
+    (cache misses) are timed and counted as misses.
+    """
+    def decorator(func):
+        if not ENABLED:
+            return cache_decorator(func)
+
+        @wraps(func)
+        def on_miss(*args, **kwargs):
+            REGISTRY.incr("cache_misses_total", name)
+            with _Span(f"cache.{name}"):
+                return func(*args, **kwargs)
+
+        cached_func = cache_decorator(on_miss)
+
+        @wraps(func)
+        def lookup(*args, **kwargs):
+            REGISTRY.incr("cache_requests_total", name)
+            return cached_func(*args, **kwargs)
+        return lookup
+    return decorator
+
+
+def write_metrics(path: str):
+    """Write the current metrics to `path` (JSON for *.json, Prometheus text otherwise)."""
+    payload = REGISTRY.to_json() if path.endswith(".json") else REGISTRY.to_prometheus()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, content_type = REGISTRY.to_json(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, content_type = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1"):
+    """
+    Serve metrics on a background thread.
+
+    Idempotent; does nothing when disabled or when no port is given or configured.
+    """
+    global _server
+    port = port or (int(METRICS_PORT) if METRICS_PORT else None)
+    if not ENABLED or port is None:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"⚠ Metrics server not started on port {port}: {e}")
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+if ENABLED and METRICS_FILE:
+    atexit.register(write_metrics, METRICS_FILE)
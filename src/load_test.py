@@ -0,0 +1,256 @@
+"""
+Headless load and soak test for the dashboard.
+
+Each simulated session opens app.py with Streamlit's AppTest, then visits every
+sidebar page and drives every selectbox, radio and button on it (a few random
+options each), timing each rerun. No server, browser or network is needed.
+
+Datasets of each requested size come from `generate_dataset` and are served
+through CAREER_COMPASS_DATA. For each size, `--concurrency` worker processes
+run sessions side by side. AppTest isn't thread-safe, so each process stands in
+for one server: its sessions share Streamlit's caches, the first one starting
+cold. Reported per dataset size:
+
+- latency percentiles per rerun, grouped by initial load, page switch and
+  widget interaction, plus cold (first session per worker) vs warm;
+- memory per session from tracemalloc: the peak above the pre-session baseline
+  and what stays allocated afterwards (growth across a soak run points at a
+  leak), plus each worker's max RSS. tracemalloc slows Python down, so use
+  --no-trace-memory for clean latency numbers;
+- cache effectiveness from the instrumentation counters (src/instrumentation.py).
+
+An existing outputs/market_sketch.bin or data/trends/ store is read as usual,
+so move them aside to measure the raw-DataFrame paths.
+
+Examples:
+    python -m src.load_test --sizes 1000,10000,100000 --concurrency 4 --sessions 3
+    python -m src.load_test --sizes 50000 --concurrency 2 --duration 900 --json soak.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+WIDGET_KINDS = ("selectbox", "radio", "button")
+
+
+def write_dataset(n_records: int, directory: str, seed: int = 0) -> str:
+    from src.generate_synthetic_data import generate_dataset
+
+    random.seed(seed)
+    np.random.seed(seed)
+    path = os.path.join(directory, f"jobs_{n_records}.csv")
+    generate_dataset(n_records).to_csv(path, index=False)
+    return path
+
+
+def _init_worker(data_path: str):
+    os.environ["CAREER_COMPASS_DATA"] = data_path
+    os.environ["CAREER_COMPASS_METRICS"] = "1"
+    # Bare-mode and deprecation warnings would otherwise be logged on every rerun
+    logging.disable(logging.WARNING)
+
+
+class Session:
+    """One simulated user walking every page and widget."""
+
+    def __init__(self, rng: random.Random, choices: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.rng = rng
+        self.choices = choices
+        self.samples: List[tuple] = []
+        self.errors: List[str] = []
+
+    def _step(self, group: str, action: str, rerun):
+        start = time.perf_counter()
+        rerun()
+        self.samples.append((group, action, time.perf_counter() - start))
+        for exception in self.app.exception:
+            self.errors.append(f"{action}: {exception.message}")
+
+    def run(self):
+        self._step("load", "load", self.app.run)
+        for page in self.app.sidebar.radio[0].options:
+            self._step("page", page, lambda: self.app.sidebar.radio[0].set_value(page).run())
+            self._exercise_widgets(page)
+
+    def _exercise_widgets(self, page: str):
+        for kind in WIDGET_KINDS:
+            # Widgets are looked up again after every rerun, since the element tree is rebuilt
+            for i in range(len(getattr(self.app.main, kind))):
+                widget = getattr(self.app.main, kind)[i]
+                action = f"{page} / {widget.label}"
+                if kind == "button":
+                    self._step("widget", action, lambda: getattr(self.app.main, kind)[i].click().run())
+                    continue
+                options = list(widget.options)
+                for value in self.rng.sample(options, min(self.choices, len(options))):
+                    self._step("widget", action, lambda: getattr(self.app.main, kind)[i].set_value(value).run())
+
+
+def run_worker(worker: int, sessions: int, duration: float, choices: int, timeout: float,
+               trace_memory: bool, seed: int) -> Dict:
+    """Run sessions back to back in this process and return raw measurements."""
+    from src.instrumentation import REGISTRY
+
+    rng = random.Random(seed * 1000 + worker)
+    if trace_memory:
+        tracemalloc.start()
+    results = []
+    start = time.perf_counter()
+    while len(results) < sessions or (duration and time.perf_counter() - start < duration):
+        if trace_memory:
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        session = Session(rng, choices, timeout)
+        try:
+            session.run()
+        except Exception as e:  # a failed rerun shouldn't end the whole run
+            session.errors.append(f"{type(e).__name__}: {e}")
+        result = {"samples": session.samples, "errors": session.errors}
+        if trace_memory:
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+            del session
+            gc.collect()
+            result["retained_bytes"] = tracemalloc.get_traced_memory()[0] - baseline
+        results.append(result)
+        if duration and len(results) >= sessions and time.perf_counter() - start >= duration:
+            break
+
+    return {
+        "sessions": results,
+        "caches": REGISTRY.snapshot()["caches"],
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"n": len(values), "p50_ms": p50 * 1e3, "p90_ms": p90 * 1e3, "p99_ms": p99 * 1e3,
+            "max_ms": max(values) * 1e3}
+
+
+def summarize(n_records: int, workers: List[Dict]) -> Dict:
+    sessions = [s for w in workers for s in w["sessions"]]
+    samples = [sample for s in sessions for sample in s["samples"]]
+    latency = {"all": _percentiles([secs for _, _, secs in samples])}
+    for group in ("load", "page", "widget"):
+        latency[group] = _percentiles([secs for g, _, secs in samples if g == group])
+    latency["cold_session"] = _percentiles([secs for w in workers for _, _, secs in w["sessions"][0]["samples"]])
+    latency["warm_sessions"] = _percentiles(
+        [secs for w in workers for s in w["sessions"][1:] for _, _, secs in s["samples"]]
+    )
+    slowest: Dict[str, List[float]] = {}
+    for _, action, secs in samples:
+        slowest.setdefault(action, []).append(secs)
+    by_action = {action: _percentiles(values) for action, values in slowest.items()}
+
+    caches: Dict[str, Dict[str, float]] = {}
+    for w in workers:
+        for name, stats in w["caches"].items():
+            total = caches.setdefault(name, {"requests": 0, "misses": 0})
+            total["requests"] += stats["requests"]
+            total["misses"] += stats["misses"]
+    for stats in caches.values():
+        stats["hit_ratio"] = 1 - stats["misses"] / stats["requests"] if stats["requests"] else 0.0
+
+    report = {
+        "records": n_records,
+        "workers": len(workers),
+        "sessions": len(sessions),
+        "errors": [e for s in sessions for e in s["errors"]],
+        "latency": latency,
+        "by_action": by_action,
+        "caches": caches,
+        "max_rss_mb": max(w["max_rss_kb"] for w in workers) / 1024,
+    }
+    if "peak_bytes" in sessions[0]:
+        report["memory"] = {
+            "session_peak_mb_p50": float(np.median([s["peak_bytes"] for s in sessions])) / 2**20,
+            "session_peak_mb_max": max(s["peak_bytes"] for s in sessions) / 2**20,
+            "retained_mb_first_session": max(s["retained_bytes"] for s in
+                                             (w["sessions"][0] for w in workers)) / 2**20,
+            "retained_mb_per_warm_session": float(np.mean(
+                [s["retained_bytes"] for w in workers for s in w["sessions"][1:]] or [0.0]
+            )) / 2**20,
+        }
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\n=== {report['records']:,} records · {report['workers']} workers · {report['sessions']} sessions ===")
+    print(f"{'reruns':<16}{'n':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in report["latency"].items():
+        if stats:
+            print(f"{name:<16}{stats['n']:>6}{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}"
+                  f"{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+    slowest = sorted(report["by_action"].items(), key=lambda item: -item[1]["p90_ms"])[:5]
+    print("slowest actions (p90 ms): " + "; ".join(f"{a} {s['p90_ms']:.0f}" for a, s in slowest))
+    if "memory" in report:
+        m = report["memory"]
+        print(f"memory/session: peak p50 {m['session_peak_mb_p50']:.1f} MB (max {m['session_peak_mb_max']:.1f}), "
+              f"retained {m['retained_mb_first_session']:.1f} MB cold, "
+              f"{m['retained_mb_per_warm_session']:.2f} MB per warm session")
+    print(f"worker max RSS: {report['max_rss_mb']:.0f} MB")
+    for name, stats in sorted(report["caches"].items()):
+        print(f"cache {name:<24} {stats['requests']:>7} lookups  hit ratio {stats['hit_ratio']:.1%}")
+    if report["errors"]:
+        print(f"⚠ {len(report['errors'])} errors, first: {report['errors'][0]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless load/soak test of the Streamlit dashboard.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated dataset sizes")
+    parser.add_argument("--concurrency", type=int, default=2, help="Worker processes running sessions")
+    parser.add_argument("--sessions", type=int, default=3, help="Sessions per worker")
+    parser.add_argument("--duration", type=float, default=0,
+                        help="Soak: keep each worker running sessions for this many seconds")
+    parser.add_argument("--choices", type=int, default=2, help="Options tried per selectbox/radio")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-rerun timeout in seconds")
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    reports = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_records in (int(size) for size in args.sizes.split(",")):
+            data_path = write_dataset(n_records, directory, args.seed)
+            # A fresh pool per size so every size starts with cold caches
+            with ProcessPoolExecutor(max_workers=args.concurrency, initializer=_init_worker,
+                                     initargs=(data_path,),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(run_worker, worker, args.sessions, args.duration, args.choices,
+                                       args.timeout, args.trace_memory, args.seed)
+                           for worker in range(args.concurrency)]
+                report = summarize(n_records, [f.result() for f in futures])
+            print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    if any(report["errors"] for report in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Compact, versioned artifact format for the salary model.
+
+A bundle is one file holding a flattened RandomForestRegressor, the feature
+vocabulary, training metadata and a checksum:
+
+    magic (8 bytes) | format version (uint32) | header length (uint32) | JSON header
+    | padding to 64 bytes | node arrays, each 64-byte aligned
+
+Node arrays use the narrowest dtype that fits: children and feature ids are
+int16 when possible (int32 otherwise), thresholds and leaf values float32.
+Child ids are local to their tree, so the arrays can be used straight from an
+np.memmap without any fix-up on load. The checksum is a SHA-256 of the header
+fields (vocabulary, metadata, array layout) and the array section, so a bundle
+whose feature names were edited fails verification just like corrupted nodes.
+
+Thresholds are stored as float32, which is the precision sklearn compares
+features at, so predictions only differ by float32 rounding of leaf values.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"CCMODEL\0"
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+# Rows traversed per block in predict(); bounds the (rows x trees) index arrays.
+PREDICT_BLOCK_ROWS = 4096
+
+
+class ArtifactError(ValueError):
+    """Raised when a bundle is malformed, from an unknown version or fails its checksum."""
+
+
+def _index_dtype(max_value: int):
+    return np.int16 if max_value < np.iinfo(np.int16).max else np.int32
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _checksum(fields: Dict, data) -> str:
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def flatten_forest(model) -> Dict[str, np.ndarray]:
+    """Concatenate the trees of a fitted sklearn forest into flat node arrays."""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    node_counts = [tree.node_count for tree in trees]
+    child_dtype = _index_dtype(max(node_counts))
+    feature_dtype = _index_dtype(model.n_features_in_)
+
+    tree_offsets = np.zeros(len(trees) + 1, dtype=np.int64)
+    np.cumsum(node_counts, out=tree_offsets[1:])
+    return {
+        "tree_offsets": tree_offsets,
+        "children_left": np.concatenate([t.children_left for t in trees]).astype(child_dtype),
+        "children_right": np.concatenate([t.children_right for t in trees]).astype(child_dtype),
+        "feature": np.concatenate([t.feature for t in trees]).astype(feature_dtype),
+        "threshold": np.concatenate([t.threshold for t in trees]).astype(np.float32),
+        "value": np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float32),
+    }
+
+
+def save_bundle(model, features: List[str], path: str, metadata: Optional[Dict] = None):
+    """Write `model` and its feature names to a single bundle file at `path`."""
+    arrays = flatten_forest(model)
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    data = bytearray(_align(offset))
+    for name, array in arrays.items():
+        start = layout[name]["offset"]
+        data[start:start + array.nbytes] = array.tobytes()
+
+    fields = {"features": list(features), "metadata": metadata or {}, "arrays": layout}
+    header = json.dumps(dict(fields, sha256=_checksum(fields, data))).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - _PREAMBLE.size - len(header)))
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CompactForest:
+    """Read-only forest backed by memory-mapped node arrays."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], features: List[str], metadata: Dict, checksum: str):
+        self.tree_offsets = arrays["tree_offsets"]
+        self.children_left = arrays["children_left"]
+        self.children_right = arrays["children_right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.features = features
+        self.metadata = metadata
+        self.checksum = checksum
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_offsets) - 1
+
+    def predict(self, X) -> np.ndarray:
+        """Average the leaf values reached by each row in every tree."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(f"Expected input of shape (n, {len(self.features)}), got {X.shape}")
+        predictions = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], PREDICT_BLOCK_ROWS):
+            block = X[start:start + PREDICT_BLOCK_ROWS]
+            predictions[start:start + len(block)] = self._predict_block(block)
+        return predictions
+
+    def _predict_block(self, X: np.ndarray) -> np.ndarray:
+        roots = self.tree_offsets[:-1]
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.repeat(roots[None, :], X.shape[0], axis=0)
+        while True:
+            left = self.children_left[node]
+            is_leaf = left == -1
+            if is_leaf.all():
+                break
+            # Leaves store feature -2 (sklearn's TREE_UNDEFINED), which isn't a valid
+            # column with a single feature; they don't move, so read column 0 instead
+            feature = np.where(is_leaf, 0, self.feature[node])
+            go_left = X[rows, feature] <= self.threshold[node]
+            child = np.where(go_left, left, self.children_right[node])
+            node = np.where(is_leaf, node, roots + child)
+        return self.value[node].mean(axis=1, dtype=np.float64)
+
+
+def load_bundle(path: str, verify: bool = True) -> CompactForest:
+    """Memory-map a bundle; node arrays are views into the file, not copies."""
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    if len(mapped) < _PREAMBLE.size:
+        raise ArtifactError(f"{path} is too small to be a model bundle")
+    magic, version, header_len = _PREAMBLE.unpack(mapped[:_PREAMBLE.size].tobytes())
+    if magic != MAGIC:
+        raise ArtifactError(f"{path} is not a model bundle")
+    if version != FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported bundle version {version} (expected {FORMAT_VERSION})")
+
+    header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_len].tobytes())
+    data = mapped[_align(_PREAMBLE.size + header_len):]
+    fields = {name: header[name] for name in ("features", "metadata", "arrays")}
+    if verify and _checksum(fields, data) != header["sha256"]:
+        raise ArtifactError(f"Checksum mismatch in {path}")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        start = spec["offset"]
+        arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+    return CompactForest(arrays, header["features"], header["metadata"], header["sha256"])
+
+
+if __name__ == "__main__":
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Convert a pickled salary model into a compact bundle.")
+    parser.add_argument("--model", default="salary_model.pkl")
+    parser.add_argument("--skills", default="skills.pkl")
+    parser.add_argument("--output", default="salary_model.bundle")
+    args = parser.parse_args()
+
+    save_bundle(joblib.load(args.model), joblib.load(args.skills), args.output,
+                metadata={"source": os.path.basename(args.model)})
+    print(f"✓ Wrote {args.output} ({os.path.getsize(args.output) / 1e6:.2f} MB, "
+          f"pickle was {os.path.getsize(args.model) / 1e6:.2f} MB)")
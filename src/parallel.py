@@ -0,0 +1,168 @@
+"""
+Process-pool backend for the per-row string transforms of the pipeline
+(skill tokenization, salary parsing, skill extraction from descriptions).
+
+The input strings are packed once into a shared-memory block (UTF-8 bytes plus
+an int64 offsets table). Workers receive only the block name and a row range,
+so the input is never pickled; only the per-partition results travel back.
+Results are returned in input order, and vocabularies are merged as a sorted
+union, so the output does not depend on the number of workers.
+
+Per-row results (`parallel_apply`) are pickled back to the parent, which is
+only worth it when the transform is expensive relative to its output. For
+cheap transforms such as skill tokenization, keep the per-row output in the
+workers: have the partition function return a compact result (a vocabulary
+set, CSR index arrays) instead. `SharedStrings` packs the input once for several
+passes, and `worker_pool` shares one pool across calls.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+
+from src.instrumentation import span
+
+# Below this many rows a process pool costs more than it saves.
+MIN_PARALLEL_ROWS = 20_000
+# Partitions per worker, so uneven rows don't leave cores idle.
+PARTITIONS_PER_WORKER = 4
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _pack(values: List[str]) -> shared_memory.SharedMemory:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    header = offsets.nbytes
+    block = shared_memory.SharedMemory(create=True, size=max(header + int(offsets[-1]), 1))
+    block.buf[:header] = offsets.tobytes()
+    block.buf[header:header + int(offsets[-1])] = b"".join(encoded)
+    return block
+
+
+def _unpack(block_name: str, n_rows: int, start: int, end: int) -> List[str]:
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        offsets = np.frombuffer(block.buf, dtype=np.int64, count=n_rows + 1)[start:end + 1].copy()
+        header = (n_rows + 1) * 8
+        blob = bytes(block.buf[header + offsets[0]:header + offsets[-1]])
+    finally:
+        block.close()
+    base = offsets[0]
+    return [blob[offsets[i] - base:offsets[i + 1] - base].decode("utf-8") for i in range(end - start)]
+
+
+def _run_partition(func, block_name, n_rows, start, end):
+    return func(_unpack(block_name, n_rows, start, end))
+
+
+def _partition_bounds(n_rows: int, n_parts: int):
+    edges = np.linspace(0, n_rows, n_parts + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+class SharedStrings:
+    """Strings packed into shared memory once, for several `map_partitions` passes."""
+
+    def __init__(self, values: Iterable[str]):
+        self.values = list(values)
+        self._block = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def block_name(self) -> str:
+        if self._block is None:
+            with span("parallel.pack"):
+                self._block = _pack(self.values)
+        return self._block.name
+
+    def close(self):
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> "SharedStrings":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def worker_pool(workers: Optional[int] = None):
+    """A process pool to pass to several `map_partitions` calls (None when running in-process)."""
+    workers = workers or default_workers()
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield pool
+
+
+def map_partitions(func: Callable[[List[str]], object], values: Iterable[str],
+                   workers: Optional[int] = None, pool: Optional[ProcessPoolExecutor] = None) -> list:
+    """
+    Apply `func` to contiguous partitions of `values` and return the results in order.
+
+    `func` takes a list of strings and must be picklable (a module-level function
+    or a functools.partial of one). Small inputs or `workers=1` run in-process.
+    `values` may be a `SharedStrings` to reuse its packed block, and `pool` an
+    executor from `worker_pool` to reuse across calls.
+    """
+    shared = values if isinstance(values, SharedStrings) else SharedStrings(values)
+    workers = workers or default_workers()
+    if workers <= 1 or len(shared) < MIN_PARALLEL_ROWS:
+        return [func(shared.values)]
+
+    bounds = _partition_bounds(len(shared), workers * PARTITIONS_PER_WORKER)
+    try:
+        executor_context = nullcontext(pool) if pool is not None else worker_pool(workers)
+        with span("parallel.map"), executor_context as executor:
+            futures = [
+                executor.submit(_run_partition, func, shared.block_name, len(shared), start, end)
+                for start, end in bounds
+            ]
+            return [f.result() for f in futures]
+    finally:
+        if shared is not values:
+            shared.close()
+
+
+def _apply_each(func, values):
+    return [func(v) for v in values]
+
+
+def parallel_apply(func: Callable[[str], object], values: Iterable[str],
+                   workers: Optional[int] = None, pool: Optional[ProcessPoolExecutor] = None) -> list:
+    """Row-wise `func` over `values` across processes, like `Series.apply` but parallel."""
+    results = []
+    for part in map_partitions(partial(_apply_each, func), values, workers, pool):
+        results.extend(part)
+    return results
+
+
+def _token_set(tokenize, values):
+    tokens = set()
+    for v in values:
+        tokens.update(tokenize(v))
+    return tokens
+
+
+def collect_vocabulary(tokenize: Callable[[str], List[str]], values: Iterable[str],
+                       workers: Optional[int] = None, pool: Optional[ProcessPoolExecutor] = None) -> set:
+    """Union of `tokenize(v)` over all values, computed per partition and merged."""
+    vocabulary = set()
+    for tokens in map_partitions(partial(_token_set, tokenize), values, workers, pool):
+        vocabulary |= tokens
+    return vocabulary
@@ -1,22 +1,186 @@
+import logging
+import os
+import threading
+import time
+
 import joblib
 
-# Load model and skill list (normalize skill names)
-model = joblib.load("salary_model.pkl")
-skills_list = [s.strip() for s in joblib.load("skills.pkl")]
+from src.instrumentation import span, timed
+from src.model_artifact import load_bundle
+from src.prediction_cache import PredictionCache
+
+BUNDLE_PATH = "salary_model.bundle"
+MODEL_PATH = "salary_model.pkl"
+SKILLS_PATH = "skills.pkl"
+# How often (seconds) predict_salary checks whether the model file was replaced
+MODEL_CHECK_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+model = None
+skills_list = []
+model_version = None
+prediction_cache = PredictionCache()
+
+_skill_ids = {}      # canonical skill name -> bit in the skill mask
+_column_bits = []    # bit for each model feature column
+_model_stamp = None
+_last_check = 0.0
+# Guards the model globals above so a prediction never mixes two models'
+# state; _reload_lock lets one thread reload while others keep predicting.
+_model_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def _model_file():
+    # A bundle older than the pickle is left over from a previous training run
+    if not os.path.exists(BUNDLE_PATH):
+        return MODEL_PATH
+    if os.path.exists(MODEL_PATH) and os.path.getmtime(MODEL_PATH) > os.path.getmtime(BUNDLE_PATH):
+        return MODEL_PATH
+    return BUNDLE_PATH
+
+
+def _stamp(path):
+    # The pickled model is only current together with its skill list
+    paths = [path, SKILLS_PATH] if path == MODEL_PATH else [path]
+    return tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+
+def load_model():
+    """(Re)load the model and skill list and drop predictions cached for the previous model.
+
+    Prefers the memory-mapped bundle; falls back to the pickles when there is
+    no bundle or the pickle was written after it.
+    """
+    global model, skills_list, model_version, _skill_ids, _column_bits, _model_stamp
+    path = _model_file()
+    with span("predict.load_model"):
+        stamp = _stamp(path)
+        if path == BUNDLE_PATH:
+            new_model = load_bundle(path)
+            features = new_model.features
+            version = new_model.checksum
+        else:
+            new_model = joblib.load(MODEL_PATH)
+            features = joblib.load(SKILLS_PATH)
+            version = "pkl-" + "-".join(f"{mtime}-{size}" for _, mtime, size in stamp)
+            # Catches a skill list written by a different training run than the model
+            trained_on = getattr(new_model, "feature_names_in_", None)
+            if len(features) != new_model.n_features_in_ or \
+                    (trained_on is not None and list(trained_on) != list(features)):
+                raise ValueError(f"{SKILLS_PATH} does not match the features of {MODEL_PATH}")
+
+    # Normalize skill names; columns that differ only by case or whitespace share a bit
+    names = [s.strip() for s in features]
+    skill_ids = {}
+    for skill in names:
+        skill_ids.setdefault(skill.lower(), len(skill_ids))
+    column_bits = [skill_ids[s.lower()] for s in names]
+    with _model_lock:
+        model, skills_list, model_version = new_model, names, version
+        _skill_ids, _column_bits, _model_stamp = skill_ids, column_bits, stamp
+    prediction_cache.clear(version)
+
+
+def _check_model_current():
+    global _last_check
+    now = time.monotonic()
+    if now - _last_check < MODEL_CHECK_INTERVAL:
+        return
+    _last_check = now
+    try:
+        stamp = _stamp(_model_file())
+    except OSError:
+        return
+    # Another thread already reloading: keep serving the current model meanwhile
+    if stamp != _model_stamp and _reload_lock.acquire(blocking=False):
+        try:
+            if stamp != _model_stamp:
+                load_model()
+        except Exception as e:
+            # e.g. a pickle caught mid-write by a training run; retried on the next check
+            logger.warning("Keeping the current model, reload failed: %s", e)
+        finally:
+            _reload_lock.release()
+
 
+def _snapshot():
+    with _model_lock:
+        return model, model_version, skills_list, _skill_ids, _column_bits
 
+
+def skill_mask(candidate_skills, skill_ids=None):
+    """Pack the candidate's known skills into an integer bitmask of canonical skill ids.
+
+    Skills are matched ignoring case and surrounding whitespace.
+    """
+    skill_ids = _skill_ids if skill_ids is None else skill_ids
+    mask = 0
+    for skill in candidate_skills:
+        bit = skill_ids.get(skill.strip().lower())
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def _missing_skills(mask, names, column_bits):
+    return tuple([s for s, bit in zip(names, column_bits) if not (mask >> bit) & 1][:5])
+
+
+def _input_vector(mask, column_bits):
+    return [(mask >> bit) & 1 for bit in column_bits]
+
+
+@timed("predict.predict_salary")
 def predict_salary(candidate_skills):
     """Predict salary and return top missing skills.
 
-    candidate_skills: list of skill strings (assumed already lowercased/stripped)
+    candidate_skills: list of skill strings, in any case
     """
-    candidate_skills = [s.strip() for s in candidate_skills]
-    input_vector = [1 if skill in candidate_skills else 0 for skill in skills_list]
-    salary = model.predict([input_vector])
+    _check_model_current()
+    current, version, names, skill_ids, column_bits = _snapshot()
+    mask = skill_mask(candidate_skills, skill_ids)
+    key = (version, mask)
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        return cached[0], list(cached[1])
+
+    salary = current.predict([_input_vector(mask, column_bits)])
+
+    result = (float(salary[0]), _missing_skills(mask, names, column_bits))
+    prediction_cache.put(key, result)
+    return result[0], list(result[1])
+
+
+@timed("predict.predict_salaries")
+def predict_salaries(candidates):
+    """Batch version of predict_salary: one model call for all uncached skill sets.
+
+    candidates: iterable of skill lists. Returns a list of (salary, missing_skills).
+    """
+    _check_model_current()
+    current, version, names, skill_ids, column_bits = _snapshot()
+    masks = [skill_mask(c, skill_ids) for c in candidates]
+    results = {}
+    pending = []
+    for mask in dict.fromkeys(masks):
+        cached = prediction_cache.get((version, mask))
+        if cached is not None:
+            results[mask] = cached
+        else:
+            pending.append(mask)
+
+    if pending:
+        salaries = current.predict([_input_vector(mask, column_bits) for mask in pending])
+        for mask, salary in zip(pending, salaries):
+            results[mask] = (float(salary), _missing_skills(mask, names, column_bits))
+            prediction_cache.put((version, mask), results[mask])
+
+    return [(results[mask][0], list(results[mask][1])) for mask in masks]
 
-    missing_skills = [s for s in skills_list if s not in candidate_skills]
 
-    return float(salary[0]), missing_skills[:5]
+load_model()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+"""
+Bounded result cache for the prediction path.
+
+Keys are `(model_version, skill_mask)` where `skill_mask` packs the candidate's
+canonical skill ids into one integer, so any ordering, casing or duplication of
+the same skills hits the same entry. Entries are evicted least-recently-used
+beyond `maxsize` and expire after `ttl` seconds.
+
+Set `shared_path` (or CAREER_COMPASS_PREDICTION_CACHE) to a SQLite file to
+share results between processes, e.g. several Streamlit or scoring workers;
+the in-process LRU stays in front of it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from src.instrumentation import incr
+
+DEFAULT_MAXSIZE = int(os.getenv("CAREER_COMPASS_PREDICTION_CACHE_SIZE", "4096"))
+DEFAULT_TTL = float(os.getenv("CAREER_COMPASS_PREDICTION_CACHE_TTL", "0")) or None
+DEFAULT_SHARED_PATH = os.getenv("CAREER_COMPASS_PREDICTION_CACHE")
+# The shared tier holds this many times `maxsize` rows and is trimmed every
+# SHARED_TRIM_EVERY writes.
+SHARED_SIZE_FACTOR = 16
+SHARED_TRIM_EVERY = 256
+
+
+class PredictionCache:
+    """LRU + TTL cache with an optional SQLite tier shared across processes."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: Optional[float] = DEFAULT_TTL,
+                 shared_path: Optional[str] = DEFAULT_SHARED_PATH, name: str = "predict_salary"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._shared = None
+        self._shared_writes = 0
+        if shared_path:
+            self._shared = sqlite3.connect(shared_path, timeout=5, check_same_thread=False)
+            self._shared.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "version TEXT, mask TEXT, result TEXT, created REAL, PRIMARY KEY (version, mask))"
+            )
+            self._shared.commit()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key: Tuple[str, int]):
+        """Return the cached result for `key`, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[0], now):
+                self._entries.move_to_end(key)
+                self._record(hit=True)
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+
+        result = self._shared_get(key, now)
+        if result is not None:
+            with self._lock:
+                self._store(key, result, now)
+        self._record(hit=result is not None)
+        return result
+
+    def put(self, key: Tuple[str, int], result):
+        now = time.time()
+        with self._lock:
+            self._store(key, result, now)
+        if self._shared is not None:
+            version, mask = key
+            with self._lock:
+                self._shared.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                    (version, str(mask), json.dumps(result), now),
+                )
+                self._shared_writes += 1
+                if self._shared_writes % SHARED_TRIM_EVERY == 0:
+                    self._trim_shared(now)
+                self._shared.commit()
+
+    def _trim_shared(self, now):
+        if self.ttl is not None:
+            self._shared.execute("DELETE FROM predictions WHERE created < ?", (now - self.ttl,))
+        self._shared.execute(
+            "DELETE FROM predictions WHERE rowid IN (SELECT rowid FROM predictions "
+            "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize * SHARED_SIZE_FACTOR,),
+        )
+
+    def _store(self, key, result, now):
+        self._entries[key] = (now, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _shared_get(self, key, now):
+        if self._shared is None:
+            return None
+        version, mask = key
+        with self._lock:
+            row = self._shared.execute(
+                "SELECT result, created FROM predictions WHERE version = ? AND mask = ?",
+                (version, str(mask)),
+            ).fetchone()
+        if row is None or self._expired(row[1], now):
+            return None
+        salary, gaps = json.loads(row[0])
+        return salary, tuple(gaps)
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        incr("cache_requests_total", self.name)
+        if not hit:
+            incr("cache_misses_total", self.name)
+
+    def clear(self, version: Optional[str] = None):
+        """Drop in-process entries; with `version`, also drop shared rows of other model versions."""
+        with self._lock:
+            self._entries.clear()
+            if self._shared is not None and version is not None:
+                self._shared.execute("DELETE FROM predictions WHERE version != ?", (version,))
+                self._shared.commit()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
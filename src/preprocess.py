@@ -1,8 +1,13 @@
-
+import argparse
 import pandas as pd
 import re
 
-df = pd.read_csv("data/raw_jobs.csv")
+from src.instrumentation import span
+from src.parallel import parallel_apply, worker_pool
+
+RAW_PATH = "data/raw_jobs.csv"
+CLEANED_PATH = "data/cleaned_jobs.csv"
+
 
 def extract_salary(salary):
     numbers = re.findall(r'\d+', salary)
@@ -10,7 +15,39 @@ def extract_salary(salary):
         return (int(numbers[0]) + int(numbers[1])) / 2
     return None
 
-df["salary_lpa"] = df["salary"].apply(extract_salary)
-df.dropna(inplace=True)
 
-df.to_csv("data/cleaned_jobs.csv", index=False)
+def clean_jobs(df, workers=1, pool=None):
+    """Parse the salary column and drop incomplete rows."""
+    df["salary_lpa"] = parallel_apply(extract_salary, df["salary"], workers, pool)
+    return df.dropna()
+
+
+def main(chunksize=None, workers=1):
+    """Clean raw_jobs.csv; with `chunksize`, stream it so memory stays bounded per chunk."""
+    if chunksize is None:
+        with span("preprocess.read_csv"):
+            df = pd.read_csv(RAW_PATH)
+
+        with span("preprocess.extract_salary"):
+            df = clean_jobs(df, workers)
+
+        with span("preprocess.write_csv"):
+            df.to_csv(CLEANED_PATH, index=False)
+        return
+
+    with worker_pool(workers) as pool:
+        for i, chunk in enumerate(pd.read_csv(RAW_PATH, chunksize=chunksize)):
+            with span("preprocess.extract_salary"):
+                chunk = clean_jobs(chunk, workers, pool)
+            with span("preprocess.write_csv"):
+                chunk.to_csv(CLEANED_PATH, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean raw job listings.")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the input in chunks of this many rows")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for salary parsing (0 = all cores)")
+    args = parser.parse_args()
+    main(chunksize=args.chunksize, workers=args.workers or None)
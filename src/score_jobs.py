@@ -0,0 +1,212 @@
+"""
+Bulk scoring of job postings or resumes from JSONL/CSV.
+
+Reads rows one at a time from a file or stdin, takes each row's skills from a
+skills column (comma-separated string or JSON list) or extracts them from a
+free-text column, predicts salaries in fixed-size batches and streams the rows
+back out with `predicted_salary_lpa` and `skill_gaps` added. Memory is bounded
+by `--batch-size` x (in-flight batches). Model load time and scoring throughput
+(excluding the load) are reported on stderr.
+
+CSV output needs one set of columns. By default it is the first scored row's;
+a later row with other keys (heterogeneous JSONL) is an error. Pass `--fields`
+to fix the columns instead: missing values are left empty and other keys dropped.
+
+Examples:
+    python -m src.score_jobs postings.jsonl --text-field description -o scored.jsonl
+    python -m src.score_jobs postings.jsonl -o scored.csv --fields title,company,predicted_salary_lpa,skill_gaps
+    cat resumes.csv | python -m src.score_jobs --format csv --skills-field skills --workers 4
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from src.api_integration import extract_skills_from_description
+from src.instrumentation import span
+
+
+def _detect_format(path: Optional[str], explicit: Optional[str], default: str = "jsonl") -> str:
+    """`explicit` if given, else the file extension, else `default`."""
+    if explicit:
+        return explicit
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    if path and path.lower().endswith((".jsonl", ".json")):
+        return "jsonl"
+    return default
+
+
+def read_rows(stream, fmt: str) -> Iterator[Dict]:
+    """Yield input rows as dicts without reading the whole stream."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def row_skills(row: Dict, skills_field: str, text_field: str) -> List[str]:
+    """Model-ready skill names for a row: its skills column, else skills found in its text."""
+    skills = row.get(skills_field)
+    if skills is None or skills == "":
+        skills = extract_skills_from_description(str(row.get(text_field) or ""))
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return [s.strip().lower() for s in skills if s and s.strip()]
+
+
+def score_batch(rows: List[Dict], skills_field: str, text_field: str) -> List[Dict]:
+    """Extract skills and predict salaries for one batch of rows."""
+    # Imported here so that --help works without a trained model
+    from src.predict import predict_salaries
+
+    with span("score_jobs.extract_skills"):
+        skills = [row_skills(row, skills_field, text_field) for row in rows]
+    with span("score_jobs.predict"):
+        predictions = predict_salaries(skills)
+    scored = []
+    for row, row_skill_list, (salary, gaps) in zip(rows, skills, predictions):
+        row = dict(row)
+        row["matched_skills"] = row_skill_list
+        row["predicted_salary_lpa"] = round(salary, 2)
+        row["skill_gaps"] = gaps
+        scored.append(row)
+    return scored
+
+
+def batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_model():
+    """Load the salary model in this process (runs at import of src.predict)."""
+    # Imported here so that --help works without a trained model
+    import src.predict  # noqa: F401
+
+
+def score_stream(rows: Iterator[Dict], batch_size: int, workers: int,
+                 skills_field: str, text_field: str,
+                 pool: Optional[ProcessPoolExecutor] = None) -> Iterator[List[Dict]]:
+    """Score batches in order, keeping at most 2 x workers batches in flight (in `pool` if given)."""
+    if workers <= 1:
+        for batch in batches(rows, batch_size):
+            yield score_batch(batch, skills_field, text_field)
+        return
+
+    with (nullcontext(pool) if pool is not None else
+          ProcessPoolExecutor(max_workers=workers, initializer=load_model)) as pool:
+        in_flight = deque()
+        for batch in batches(rows, batch_size):
+            in_flight.append(pool.submit(score_batch, batch, skills_field, text_field))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class RowWriter:
+    """
+    Write scored rows as JSONL or CSV (list fields joined with ', ').
+
+    CSV columns are `fields` if given (other keys are dropped), else the first
+    row's keys; then a row with keys outside them raises ValueError rather
+    than losing data.
+    """
+
+    def __init__(self, stream, fmt: str, fields: Optional[List[str]] = None):
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = fields
+        self._csv = None
+
+    def write(self, row: Dict):
+        if self.fmt == "jsonl":
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+        flat = {k: ", ".join(v) if isinstance(v, list) else v for k, v in row.items()}
+        if self._csv is None:
+            fixed = self.fields is not None
+            self._csv = csv.DictWriter(self.stream, fieldnames=self.fields if fixed else list(flat),
+                                       extrasaction="ignore" if fixed else "raise")
+            self._csv.writeheader()
+        try:
+            self._csv.writerow(flat)
+        except ValueError:
+            unknown = sorted(set(flat) - set(self._csv.fieldnames))
+            raise ValueError(f"Row has columns {unknown} that aren't in the CSV header taken from the "
+                             f"first row; pass --fields to choose the output columns") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score job postings or resumes in bulk.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL/CSV file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from extension, else jsonl)")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], help="Output format (default: from extension, else same as input)")
+    parser.add_argument("--skills-field", default="skills", help="Column with comma-separated skills")
+    parser.add_argument("--text-field", default="description",
+                        help="Column to extract skills from when the skills column is empty")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes")
+    parser.add_argument("--fields", help="Comma-separated CSV output columns (default: the first row's)")
+    args = parser.parse_args(argv)
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+
+    in_format = _detect_format(None if args.input == "-" else args.input, args.format)
+    out_format = _detect_format(None if args.output == "-" else args.output, args.output_format, default=in_format)
+
+    in_stream = (io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+                 if args.input == "-" else open(args.input, encoding="utf-8", newline=""))
+    out_stream = (io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+                  if args.output == "-" else open(args.output, "w", encoding="utf-8", newline=""))
+
+    # Load the model (and start workers, which load it too) before timing the scoring
+    load_start = time.perf_counter()
+    load_model()
+    pool = None
+    if args.workers > 1:
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=load_model)
+        for future in [pool.submit(load_model) for _ in range(args.workers)]:
+            future.result()
+    print(f"✓ Loaded model in {time.perf_counter() - load_start:.2f}s", file=sys.stderr)
+
+    start = time.perf_counter()
+    n_rows = 0
+    try:
+        writer = RowWriter(out_stream, out_format, fields)
+        for scored in score_stream(read_rows(in_stream, in_format), args.batch_size, args.workers,
+                                   args.skills_field, args.text_field, pool):
+            for row in scored:
+                writer.write(row)
+            n_rows += len(scored)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        out_stream.flush()
+        if args.input != "-":
+            in_stream.close()
+        if args.output != "-":
+            out_stream.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Scored {n_rows} rows in {elapsed:.2f}s ({n_rows / elapsed if elapsed else 0:.0f} rows/sec)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
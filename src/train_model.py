@@ -1,23 +1,67 @@
+import argparse
+import os
+from datetime import datetime, timezone
+
 import pandas as pd
+import sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score
 import joblib
 
-df = pd.read_csv("data/model_data.csv")
+from src.feature_engineering import load_shards
+from src.instrumentation import span
+from src.model_artifact import save_bundle
+
+
+def _dump(obj, path):
+    # Written aside and renamed, so a predict process reloading meanwhile never reads half a pickle
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def main(shard_dir=None):
+    if shard_dir is None:
+        with span("train_model.read_csv"):
+            df = pd.read_csv("data/model_data.csv")
+
+        X = df.drop("salary_lpa", axis=1)
+        y = df["salary_lpa"]
+        feature_names = X.columns.tolist()
+    else:
+        # Sparse shards from `feature_engineering --chunksize`
+        with span("train_model.read_shards"):
+            X, y, feature_names = load_shards(shard_dir)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
 
-X = df.drop("salary_lpa", axis=1)
-y = df["salary_lpa"]
+    with span("train_model.fit"):
+        model = RandomForestRegressor(n_estimators=200)
+        model.fit(X_train, y_train)
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+    with span("train_model.evaluate"):
+        preds = model.predict(X_test)
+    r2 = r2_score(y_test, preds)
+    print("R2 Score:", r2)
 
-model = RandomForestRegressor(n_estimators=200)
-model.fit(X_train, y_train)
+    with span("train_model.save"):
+        _dump(feature_names, "skills.pkl")
+        _dump(model, "salary_model.pkl")
+        save_bundle(model, feature_names, "salary_model.bundle", metadata={
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "n_estimators": model.n_estimators,
+            "n_train_rows": X_train.shape[0],
+            "r2_score": float(r2),
+            "sklearn_version": sklearn.__version__,
+        })
 
-preds = model.predict(X_test)
-print("R2 Score:", r2_score(y_test, preds))
 
-joblib.dump(model, "salary_model.pkl")
-joblib.dump(X.columns.tolist(), "skills.pkl")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the salary model.")
+    parser.add_argument("--shards", default=None,
+                        help="Train from sparse feature shards instead of data/model_data.csv")
+    args = parser.parse_args()
+    main(shard_dir=args.shards)
@@ -0,0 +1,291 @@
+"""
+Day-partitioned store of collected postings with incremental rolling trends.
+
+Postings are stamped with `collected_at` (see JobDataCollector) and written to
+
+    data/trends/
+        date=YYYY-MM-DD/part-<id>.csv    raw postings, one file per landed batch
+        date=YYYY-MM-DD/sketch.bin       MarketSketch of that day's postings
+        rollups/window=W/date=YYYY-MM-DD.csv
+                                         rolling aggregates over the W days
+                                         ending on that date, one row per
+                                         (kind, name)
+
+When a batch lands, only its day's sketch is updated, and only the rollups of
+days whose windows (or the preceding windows growth compares against) contain
+that day are recomputed, each from at most 2 x 90 day sketches. A backfill
+before the oldest partition recomputes everything. Each recomputed rollup file is replaced atomically, so neither the
+cost of an update nor the bytes rewritten depend on how much history is
+stored. The dashboard reads only the rollups of the window it shows.
+
+Rollup rows:
+- kind "role" (name = title, or "*" for all roles): `postings` and
+  `median_salary` over the trailing 7/30/90 days, and `growth`, the relative
+  change in postings against the preceding window of the same length (NaN
+  until the store holds that whole preceding window).
+- kind "skill": `postings` mentioning the skill and its `growth`.
+
+Medians come from merged t-digests and carry the error bounds documented in
+src/market_sketches.py.
+
+Examples:
+    python -m src.trend_store ingest data/collected_jobs.csv
+    python -m src.trend_store ingest data/cleaned_jobs.csv --spread-days 120   # synthetic history
+    python -m src.trend_store rebuild
+    python -m src.trend_store verify     # stored rollups == full recomputation
+"""
+
+import argparse
+import os
+import re
+import shutil
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import span
+from src.market_sketches import MarketSketch, TDigest
+
+TREND_DIR = "data/trends"
+ROLLUP_DIR = "rollups"
+SKETCH_FILE = "sketch.bin"
+WINDOWS = (7, 30, 90)
+ROLLUP_COLUMNS = ["date", "window", "kind", "name", "postings", "median_salary", "growth"]
+
+_PARTITION_RE = re.compile(r"^date=(\d{4}-\d{2}-\d{2})$")
+
+
+def stamp(jobs: pd.DataFrame, when: Optional[datetime] = None) -> pd.DataFrame:
+    """Copy of `jobs` with a UTC ISO-8601 `collected_at` column (existing stamps are kept)."""
+    jobs = jobs.copy()
+    now = (when or datetime.now(timezone.utc)).isoformat()
+    if "collected_at" in jobs:
+        jobs["collected_at"] = jobs["collected_at"].fillna(now)
+    else:
+        jobs["collected_at"] = now
+    return jobs
+
+
+class TrendStore:
+    """Postings partitioned by collection day, plus rolling aggregates over them."""
+
+    def __init__(self, root: str = TREND_DIR):
+        self.root = root
+        self._sketches: Dict[date, MarketSketch] = {}
+
+    # --- partitions -----------------------------------------------------
+
+    def partition_dir(self, day: date) -> str:
+        return os.path.join(self.root, f"date={day.isoformat()}")
+
+    def days(self) -> List[date]:
+        if not os.path.isdir(self.root):
+            return []
+        found = (_PARTITION_RE.match(name) for name in os.listdir(self.root))
+        return sorted(date.fromisoformat(m.group(1)) for m in found if m)
+
+    def day_sketch(self, day: date) -> Optional[MarketSketch]:
+        if day not in self._sketches:
+            path = os.path.join(self.partition_dir(day), SKETCH_FILE)
+            if not os.path.exists(path):
+                return None
+            self._sketches[day] = MarketSketch.load(path)
+        return self._sketches[day]
+
+    def read_day(self, day: date) -> pd.DataFrame:
+        """Raw postings collected on `day`."""
+        directory = self.partition_dir(day)
+        parts = sorted(f for f in os.listdir(directory) if f.startswith("part-")) if os.path.isdir(directory) else []
+        return pd.concat([pd.read_csv(os.path.join(directory, f)) for f in parts], ignore_index=True) \
+            if parts else pd.DataFrame()
+
+    def append(self, jobs: pd.DataFrame) -> List[date]:
+        """
+        Write stamped postings (cleaned_jobs.csv columns + `collected_at`) to
+        their day partitions and refresh the affected rollups. Returns the days
+        that received rows.
+        """
+        if jobs.empty:
+            return []
+        collected = pd.to_datetime(jobs["collected_at"], utc=True, format="ISO8601")
+        stored = self.days()
+        landed = []
+        with span("trend_store.append"):
+            for day, part in jobs.groupby(collected.dt.date):
+                directory = self.partition_dir(day)
+                os.makedirs(directory, exist_ok=True)
+                part.to_csv(os.path.join(directory, f"part-{uuid.uuid4().hex[:12]}.csv"), index=False)
+                sketch = self.day_sketch(day) or MarketSketch()
+                sketch.update(part)
+                sketch.save(os.path.join(directory, SKETCH_FILE))
+                self._sketches[day] = sketch
+                landed.append(day)
+        if stored and min(landed) < stored[0]:
+            # A backfill before the oldest partition changes which days have a
+            # complete preceding window, so every rollup's growth may change
+            self.refresh(self.days())
+        else:
+            self.refresh(landed)
+        return landed
+
+    # --- rollups --------------------------------------------------------
+
+    def rollup_dir(self, window: int) -> str:
+        return os.path.join(self.root, ROLLUP_DIR, f"window={window}")
+
+    def rollups(self, window: int) -> pd.DataFrame:
+        """Rollup rows of one window length, for every stored day."""
+        directory = self.rollup_dir(window)
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".csv")) if os.path.isdir(directory) else []
+        if not files:
+            return pd.DataFrame(columns=ROLLUP_COLUMNS)
+        rollups = pd.concat(
+            [pd.read_csv(os.path.join(directory, f), keep_default_na=False, na_values=[""]) for f in files],
+            ignore_index=True,
+        )
+        rollups["date"] = pd.to_datetime(rollups["date"])
+        return rollups
+
+    def refresh(self, landed: Iterable[date]):
+        """Recompute rollups for stored days whose windows include a landed day."""
+        landed = sorted(set(landed))
+        if not landed:
+            return
+        days = self.days()
+        # A day feeds the current window of rollups up to 90 days later and the
+        # preceding window (for growth) of rollups up to 180 days later
+        horizon = timedelta(days=2 * max(WINDOWS))
+        affected = [d for d in days if any(day <= d < day + horizon for day in landed)]
+        with span("trend_store.refresh"):
+            for day in affected:
+                for window, text in self._rollup_files(day, days[0]).items():
+                    directory = self.rollup_dir(window)
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"date={day.isoformat()}.csv")
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                        f.write(text)
+                    os.replace(tmp_path, path)
+
+    def rebuild(self):
+        """Drop and recompute every rollup from the day sketches."""
+        shutil.rmtree(os.path.join(self.root, ROLLUP_DIR), ignore_errors=True)
+        self.refresh(self.days())
+
+    def stale_days(self) -> List[date]:
+        """Days whose stored rollups differ from a recomputation from the day sketches."""
+        days = self.days()
+        stale = []
+        for day in days:
+            for window, text in self._rollup_files(day, days[0]).items():
+                path = os.path.join(self.rollup_dir(window), f"date={day.isoformat()}.csv")
+                try:
+                    with open(path, encoding="utf-8", newline="") as f:
+                        current = f.read() == text
+                except OSError:
+                    current = False
+                if not current:
+                    stale.append(day)
+                    break
+        return stale
+
+    def _rollup_files(self, day: date, first_day: date) -> Dict[int, str]:
+        """CSV text of the rollup file for each window ending on `day`."""
+        rows = pd.DataFrame(self._rollup_day(day, first_day), columns=ROLLUP_COLUMNS)
+        return {window: rows[rows["window"] == window].to_csv(index=False) for window in WINDOWS}
+
+    def _rollup_day(self, day: date, first_day: date) -> List[Dict]:
+        """Rollup rows for the windows ending on `day`; `first_day` is the oldest stored partition."""
+        digests: Dict[str, TDigest] = {}
+        medians: Dict[int, Dict[str, float]] = {}
+        role_counts: List[Counter] = []
+        skill_counts: List[Counter] = []
+        # Per-day counts over two window lengths, for growth against the preceding window
+        for offset in range(2 * max(WINDOWS)):
+            sketch = self.day_sketch(day - timedelta(days=offset))
+            roles, skills = Counter(), Counter()
+            if sketch is not None:
+                for key, (count, _) in sketch.sums.items():
+                    role, experience = key.split("|", 1)
+                    if experience == "*":
+                        roles[role] = count
+                skills = sketch.skills.counter()
+                if offset < max(WINDOWS):
+                    for key, digest in sketch.digests.items():
+                        if key.endswith("|*"):
+                            digests.setdefault(key, TDigest(digest.compression)).merge(digest)
+            role_counts.append(roles)
+            skill_counts.append(skills)
+
+            if offset + 1 in WINDOWS:
+                medians[offset + 1] = {key.split("|", 1)[0]: d.quantile(0.5) for key, d in digests.items()}
+
+        rows = []
+        for window in WINDOWS:
+            # Growth against a preceding window the store doesn't fully cover would be inflated
+            has_previous = day - timedelta(days=2 * window - 1) >= first_day
+            current_roles = sum(role_counts[:window], Counter())
+            previous_roles = sum(role_counts[window:2 * window], Counter())
+            for role, postings in sorted(current_roles.items()):
+                rows.append({
+                    "date": day.isoformat(), "window": window, "kind": "role", "name": role,
+                    "postings": postings,
+                    "median_salary": medians[window].get(role, float("nan")),
+                    "growth": _growth(postings, previous_roles.get(role, 0)) if has_previous else float("nan"),
+                })
+            current_skills = sum(skill_counts[:window], Counter())
+            previous_skills = sum(skill_counts[window:2 * window], Counter())
+            for skill, postings in sorted(current_skills.items()):
+                rows.append({
+                    "date": day.isoformat(), "window": window, "kind": "skill", "name": skill,
+                    "postings": postings, "median_salary": float("nan"),
+                    "growth": _growth(postings, previous_skills.get(skill, 0)) if has_previous else float("nan"),
+                })
+        return rows
+
+
+def _growth(current: float, previous: float) -> float:
+    return (current - previous) / previous if previous else float("nan")
+
+
+def spread_over_days(jobs: pd.DataFrame, days: int, seed: int = 42) -> pd.DataFrame:
+    """Assign synthetic `collected_at` stamps over the last `days` days (for demo history)."""
+    rng = np.random.default_rng(seed)
+    end = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    offsets = rng.integers(0, days, size=len(jobs))
+    jobs = jobs.copy()
+    jobs["collected_at"] = [(end - timedelta(days=int(o))).isoformat() for o in offsets]
+    return jobs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the day-partitioned salary trend store.")
+    parser.add_argument("--root", default=TREND_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Append postings from a cleaned jobs CSV")
+    ingest.add_argument("input")
+    ingest.add_argument("--spread-days", type=int,
+                        help="Give unstamped rows synthetic timestamps over this many past days")
+    sub.add_parser("rebuild", help="Recompute all rollups from the day sketches")
+    sub.add_parser("verify", help="Check that stored rollups match a full recomputation")
+    args = parser.parse_args()
+
+    store = TrendStore(args.root)
+    if args.command == "ingest":
+        data = pd.read_csv(args.input)
+        data = spread_over_days(data, args.spread_days) if args.spread_days else stamp(data)
+        landed = store.append(data)
+        print(f"✓ Appended {len(data)} postings to {len(landed)} day partitions in {args.root}")
+    elif args.command == "rebuild":
+        store.rebuild()
+        print(f"✓ Rebuilt rollups for {len(store.days())} days in {args.root}")
+    else:
+        stale = store.stale_days()
+        if stale:
+            raise SystemExit(f"✗ {len(stale)} of {len(store.days())} days have stale rollups, "
+                             f"first {stale[0].isoformat()}; run `rebuild`")
+        print(f"✓ Rollups of all {len(store.days())} days match a full recomputation")
@@ -0,0 +1 @@
+# Dashboard pages; each module exposes render() and is imported on first use by app.py
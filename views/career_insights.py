@@ -0,0 +1,98 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from views.data import market_role_totals_and_skills
+
+ROLE_CATEGORIES = {
+    "Technical": ["Data Analyst", "Data Scientist", "Backend Developer", "Frontend Developer", 
+                 "Full Stack Developer", "Data Engineer", "Cloud Engineer", "DevOps Engineer", 
+                 "Machine Learning Engineer"],
+    "Management": ["Project Manager", "Product Manager", "Business Manager", "Operations Manager", 
+                 "Scrum Master", "Agile Coach"],
+    "Consulting": ["Strategy Consultant", "Management Consultant", "Business Analyst", 
+                  "Analytics Consultant"],
+    "Finance": ["Finance Manager", "Business Analyst Manager"]
+}
+
+CAREER_PATHS = {
+    "Data Analyst → Data Scientist → ML Engineer": 
+        ["Data Analyst", "Data Scientist", "Machine Learning Engineer"],
+    "Junior Developer → Senior Engineer → Tech Lead": 
+        ["Junior Developer", "Senior Engineer", "Technical Lead"],
+    "Business Analyst → Product Manager → Director": 
+        ["Business Analyst", "Product Manager"],
+    "Scrum Master → Agile Coach → Program Manager": 
+        ["Scrum Master", "Agile Coach", "Program Manager"]
+}
+
+
+def average_salary(totals, mask):
+    """Row-weighted average salary over the roles selected by `mask`"""
+    selected = totals[mask]
+    count = selected['count'].sum()
+    return selected['sum'].sum() / count if count else float('nan')
+
+
+def render():
+    totals, skill_stats = market_role_totals_and_skills()
+    st.markdown("### Career Path Recommendations & Insights")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("🚀 Skill Growth Potential")
+        high_demand_skills = [skill for skill, count in skill_stats.most_common(15)]
+
+        st.info(f"**High-Demand Skills (Top 15):**\n\n" + 
+                ", ".join(high_demand_skills))
+
+    with col2:
+        st.subheader("💼 Role Categories")
+        for category, roles in ROLE_CATEGORIES.items():
+            in_category = totals.index.isin(roles)
+            avg_sal = average_salary(totals, in_category)
+            count = int(totals.loc[in_category, 'count'].sum())
+            st.metric(f"📌 {category}", f"₹{avg_sal:.2f}L ({count} jobs)")
+
+    st.divider()
+
+    # Career progression
+    st.subheader("📈 Career Progression Path")
+    for path, roles_in_path in CAREER_PATHS.items():
+        with st.expander(f"📍 {path}", expanded=False):
+            salaries = [totals['mean'].get(role, float('nan')) for role in roles_in_path]
+
+            path_df = pd.DataFrame({
+                'Role': roles_in_path,
+                'Average Salary (LPA)': salaries
+            })
+
+            fig_path = px.line(
+                path_df,
+                x='Role',
+                y='Average Salary (LPA)',
+                markers=True,
+                title=f"Salary Progression: {path}"
+            )
+            fig_path.update_traces(marker=dict(size=12))
+            st.plotly_chart(fig_path, use_container_width=True)
+
+    st.divider()
+
+    # Salary insights
+    st.subheader("💰 Salary Insights")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        overall_avg = average_salary(totals, slice(None))
+        st.metric("📊 Overall Average Salary", f"₹{overall_avg:.2f}L")
+
+    with col2:
+        tech_avg = average_salary(totals, totals.index.str.contains('Developer|Engineer|Data|Cloud', regex=True))
+        st.metric("💻 Tech Roles Average", f"₹{tech_avg:.2f}L")
+
+    with col3:
+        mgmt_avg = average_salary(totals, totals.index.str.contains('Manager|Consultant|Product', regex=True))
+        st.metric("📈 Mgmt Roles Average", f"₹{mgmt_avg:.2f}L")
@@ -0,0 +1,44 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from views.common import fragment
+from views.data import get_role_certifications, get_unique_roles, market_certification_counts
+
+
+def render():
+    st.markdown("### Certification & Professional Development Guide")
+
+    st.subheader("🏆 Most Recommended Certifications")
+    cert_stats = market_certification_counts()
+    top_certs = cert_stats.most_common(15)
+    certs_df = pd.DataFrame(top_certs, columns=['Certification', 'Frequency'])
+
+    fig_certs = px.bar(
+        certs_df,
+        x='Frequency',
+        y='Certification',
+        orientation='h',
+        title="Top 15 Certifications Across All Roles",
+        color='Frequency',
+        color_continuous_scale="Viridis"
+    )
+    st.plotly_chart(fig_certs, use_container_width=True)
+
+    st.divider()
+    certifications_by_role()
+
+
+@fragment
+def certifications_by_role():
+    """Role picker for certifications; changing it reruns only this fragment"""
+    st.subheader("📋 Certifications by Role")
+    role_selection = st.selectbox("Select a role to view certifications:", get_unique_roles())
+
+    role_certs_list = get_role_certifications(role_selection)
+
+    if len(role_certs_list) > 0:
+        st.info(f"**Recommended certifications for {role_selection}:**\n\n" + 
+                "\n".join([f"✅ {cert}" for cert in role_certs_list]))
+    else:
+        st.info(f"No specific certifications found for {role_selection}")
@@ -0,0 +1,70 @@
+"""Constants and Streamlit helpers shared by the dashboard pages."""
+
+import streamlit as st
+
+# Job Portals & Companies Mapping
+JOB_PORTALS = {
+    "linkedin": {
+        "name": "LinkedIn Jobs",
+        "url": "https://www.linkedin.com/jobs",
+        "icon": "🔗"
+    },
+    "indeed": {
+        "name": "Indeed",
+        "url": "https://www.indeed.com",
+        "icon": "🔍"
+    },
+    "naukri": {
+        "name": "Naukri",
+        "url": "https://www.naukri.com",
+        "icon": "💼"
+    },
+    "glassdoor": {
+        "name": "Glassdoor",
+        "url": "https://www.glassdoor.com",
+        "icon": "⭐"
+    },
+    "monster": {
+        "name": "Monster",
+        "url": "https://www.monster.com",
+        "icon": "👾"
+    },
+    "angel": {
+        "name": "AngelList",
+        "url": "https://angel.co/jobs",
+        "icon": "😇"
+    }
+}
+
+# Role to Company Mapping
+ROLE_TO_COMPANIES = {
+    "Software Engineer": ["Google", "Microsoft", "Amazon", "Apple", "Meta", "Tesla"],
+    "Data Scientist": ["DataCamp", "Kaggle", "IBM", "McKinsey", "Deloitte"],
+    "Data Analyst": ["Tableau", "Power BI", "Deloitte", "Ernst & Young", "PwC"],
+    "Product Manager": ["Google", "Microsoft", "Amazon", "Apple", "Atlassian"],
+    "DevOps Engineer": ["Google Cloud", "AWS", "DigitalOcean", "Heroku"],
+    "ML Engineer": ["OpenAI", "DeepMind", "Tesla", "Nvidia", "Google AI"],
+    "Project Manager": ["Accenture", "Deloitte", "TCS", "Infosys", "Wipro"],
+    "Finance Manager": ["Goldman Sachs", "Morgan Stanley", "Citigroup", "ICICI Bank"],
+    "Business Analyst": ["Accenture", "Capgemini", "Cognizant", "HCL Technologies"],
+    "QA Engineer": ["Infosys", "TCS", "Wipro", "HCL", "Cognizant"],
+    "Cloud Architect": ["AWS", "Azure", "Google Cloud", "Terraform", "Kubernetes"],
+    "Agile Coach": ["ThoughtWorks", "Atlassian", "Scrum Alliance", "Scaled Agile"],
+    "Operations Manager": ["Amazon", "DHL", "UPS", "Flipkart", "Amazon"],
+    "Strategy Consultant": ["McKinsey", "BCG", "Bain & Company", "Deloitte", "EY"],
+}
+
+def portal_search_links(role):
+    """(label, url) job searches for a role on LinkedIn, Indeed and Naukri"""
+    return [
+        ("🔗 LinkedIn Jobs", f"https://www.linkedin.com/jobs/search/?keywords={role.replace(' ', '%20')}"),
+        ("🔍 Indeed Jobs", f"https://www.indeed.com/jobs?q={role.replace(' ', '+')}"),
+        ("💼 Naukri Jobs", f"https://www.naukri.com/jobs-{role.replace(' ', '-').lower()}"),
+    ]
+
+EXPERIENCE_ORDER = ["0-1 year", "1-3 years", "2-5 years", "3-7 years", "5+ years"]
+
+# Widgets inside a fragment rerun only that fragment. st.fragment needs
+# Streamlit 1.37+ (st.experimental_fragment from 1.33); older versions rerun
+# the whole page, as before.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
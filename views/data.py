@@ -0,0 +1,217 @@
+"""
+Cached data access for the dashboard pages.
+
+The dataset is loaded once per process with st.cache_resource and shared
+read-only, so callers must not mutate it. Everything else is a small derived
+result cached with st.cache_data. These functions take no DataFrame arguments,
+so Streamlit doesn't have to hash the full dataset on every rerun.
+"""
+
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.instrumentation import cached
+from src.market_sketches import SKETCH_PATH, MarketSketch
+from src.trend_store import TREND_DIR, WINDOWS, TrendStore
+
+# CAREER_COMPASS_DATA points the dashboard at another cleaned jobs CSV (e.g. for load tests)
+DATA_PATH = os.getenv("CAREER_COMPASS_DATA", 'data/cleaned_jobs.csv')
+
+
+@cached("load_role_data", st.cache_resource)
+def load_role_data():
+    df = pd.read_csv(DATA_PATH)
+    return df
+
+@cached("get_unique_roles", st.cache_data)
+def get_unique_roles():
+    return sorted(load_role_data()['title'].unique().tolist())
+
+@cached("get_experience_levels", st.cache_data)
+def get_experience_levels():
+    return sorted(load_role_data()['experience'].unique().tolist())
+
+@cached("get_skill_stats", st.cache_data)
+def get_skill_stats():
+    """Get overall skill statistics"""
+    all_skills = []
+    for skills_str in load_role_data()['skills']:
+        all_skills.extend([s.strip() for s in skills_str.split(",")])
+    return Counter(all_skills)
+
+@cached("get_certification_stats", st.cache_data)
+def get_certification_stats():
+    """Get overall certification statistics"""
+    df = load_role_data()
+    all_certs = []
+    for cert_str in df[df['certifications'].str.len() > 0]['certifications']:
+        all_certs.extend([c.strip() for c in cert_str.split(",")])
+    return Counter(all_certs)
+
+@cached("get_role_salary_totals", st.cache_data)
+def get_role_salary_totals():
+    """Per-role count, sum and mean of salary_lpa"""
+    totals = load_role_data().groupby('title')['salary_lpa'].agg(['count', 'sum', 'mean'])
+    return totals
+
+@cached("get_role_certifications", st.cache_data)
+def get_role_certifications(role):
+    """Distinct certification strings listed for a role"""
+    df = load_role_data()
+    role_certs = df[df['title'] == role]
+    return role_certs[role_certs['certifications'].str.len() > 0]['certifications'].unique().tolist()
+
+@cached("get_role_summary", st.cache_data)
+def get_role_summary(role, experience="All"):
+    """Everything the Role Lookup page shows for a (role, experience) pair, or None if no rows match"""
+    return build_role_summary(load_role_data(), role, experience)
+
+def build_role_summary(df, role, experience="All"):
+    """Uncached get_role_summary over an explicit DataFrame (also used by export_static.py)"""
+    role_data = df[df['title'] == role]
+    if experience != "All":
+        role_data = role_data[role_data['experience'] == experience]
+    if role_data.empty:
+        return None
+
+    all_skills = []
+    for skills_str in role_data['skills']:
+        all_skills.extend([s.strip() for s in skills_str.split(",")])
+    skill_counts = Counter(all_skills)
+
+    exp_salary = role_data.groupby('experience')['salary_lpa'].agg(['mean', 'count']).reset_index()
+    exp_salary = exp_salary[exp_salary['count'] > 0].sort_values('mean')
+
+    display_cols = ['title', 'experience', 'salary_lpa', 'skills', 'certifications']
+    return {
+        'avg_salary': role_data['salary_lpa'].mean(),
+        'min_salary': role_data['salary_lpa'].min(),
+        'max_salary': role_data['salary_lpa'].max(),
+        'median_salary': role_data['salary_lpa'].median(),
+        'total_records': len(role_data),
+        'top_skills': skill_counts.most_common(8),
+        'certifications': role_data[role_data['certifications'].str.len() > 0]['certifications'].unique().tolist(),
+        'exp_salary': exp_salary,
+        'sample_records': role_data[display_cols].head(10)
+    }
+
+@cached("get_salary_histogram", st.cache_data)
+def get_salary_histogram(nbins=30):
+    """Bin salaries server-side so the chart payload doesn't grow with the row count"""
+    counts, edges = np.histogram(load_role_data()['salary_lpa'].dropna(), bins=nbins)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+@cached("get_salary_box_stats", st.cache_data)
+def get_salary_box_stats(exp_order, max_outliers=50):
+    """Precompute box-plot statistics per experience level (Tukey whiskers, sampled outliers)"""
+    df = load_role_data()
+    rng = np.random.default_rng(0)
+    box_stats = []
+    for exp_level in exp_order:
+        salaries = df.loc[df['experience'] == exp_level, 'salary_lpa'].dropna().to_numpy()
+        if len(salaries) == 0:
+            continue
+        q1, median, q3 = np.percentile(salaries, [25, 50, 75])
+        iqr = q3 - q1
+        lowerfence = salaries[salaries >= q1 - 1.5 * iqr].min()
+        upperfence = salaries[salaries <= q3 + 1.5 * iqr].max()
+        outliers = salaries[(salaries < lowerfence) | (salaries > upperfence)]
+        if len(outliers) > max_outliers:
+            outliers = rng.choice(outliers, max_outliers, replace=False)
+        box_stats.append({
+            'experience': exp_level,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': lowerfence,
+            'upperfence': upperfence,
+            'mean': salaries.mean(),
+            'outliers': outliers.tolist()
+        })
+    return box_stats
+
+@cached("load_market_sketch", st.cache_resource(max_entries=1))
+def load_market_sketch(mtime):
+    """Load the ingestion-maintained sketch; `mtime` invalidates the cache when it is rewritten"""
+    return MarketSketch.load(SKETCH_PATH)
+
+def get_market_sketch():
+    """Market statistics sketch if one has been built (see src/market_sketches.py), else None"""
+    if not os.path.exists(SKETCH_PATH):
+        return None
+    return load_market_sketch(os.path.getmtime(SKETCH_PATH))
+
+# The market_* helpers answer from the sketch when it has data for that
+# statistic and from the CSV otherwise: collected postings carry no experience
+# level or certifications, so a sketch built from them can't draw every chart.
+
+def _sketch_role_totals(sketch):
+    """Per-role count, sum and mean of salary_lpa, in the shape of get_role_salary_totals"""
+    roles = sketch.roles()
+    count = pd.Series([sketch.sums[f"{role}|*"][0] for role in roles], index=roles, dtype='int64')
+    total = pd.Series([sketch.sums[f"{role}|*"][1] for role in roles], index=roles, dtype='float64')
+    return pd.DataFrame({'count': count, 'sum': total, 'mean': total / count}).rename_axis('title')
+
+def market_role_means():
+    """Average salary per role"""
+    sketch = get_market_sketch()
+    if sketch and sketch.roles():
+        return pd.Series(sketch.mean_salary_by_role())
+    return get_role_salary_totals()['mean']
+
+def market_role_totals_and_skills():
+    """
+    Per-role salary totals and skill counts from one population: the sketch if
+    it has both, else the CSV, so a page comparing them never mixes the two
+    """
+    sketch = get_market_sketch()
+    if sketch and sketch.roles() and sketch.skills.total:
+        return _sketch_role_totals(sketch), sketch.skills.counter()
+    return get_role_salary_totals(), get_skill_stats()
+
+def market_skill_counts():
+    sketch = get_market_sketch()
+    return sketch.skills.counter() if sketch and sketch.skills.total else get_skill_stats()
+
+def market_certification_counts():
+    sketch = get_market_sketch()
+    return sketch.certifications.counter() if sketch and sketch.certifications.total else get_certification_stats()
+
+def market_salary_histogram(nbins=30):
+    """Salary histogram as bin_start/bin_end/count columns, about `nbins` bars like the CSV one"""
+    sketch = get_market_sketch()
+    if not (sketch and sketch.histogram.counts.sum()):
+        return get_salary_histogram(nbins)
+    bin_start, bin_end, counts = sketch.histogram.nonempty_bins()
+    # Merge the sketch's fine bins into wider bars over the occupied range
+    step = -(-len(counts) // nbins)
+    starts = np.arange(0, len(counts), step)
+    ends = np.minimum(starts + step, len(counts)) - 1
+    hist = pd.DataFrame({'bin_start': bin_start[starts], 'bin_end': bin_end[ends],
+                         'count': np.add.reduceat(counts, starts)})
+    if sketch.histogram.overflow:
+        # Salaries above the sketch's range, shown as one last bar rather than dropped
+        width = hist['bin_end'].iloc[-1] - hist['bin_start'].iloc[-1]
+        hist.loc[len(hist)] = [sketch.histogram.high, sketch.histogram.high + width, sketch.histogram.overflow]
+    return hist
+
+def market_box_stats(exp_order):
+    sketch = get_market_sketch()
+    box_stats = sketch.box_stats(exp_order) if sketch else []
+    return box_stats or get_salary_box_stats(exp_order)
+
+@cached("load_trend_rollups", st.cache_resource(max_entries=len(WINDOWS)))
+def load_trend_rollups(window, mtime):
+    """Load one window's rollups; `mtime` invalidates the cache when a day's rollup is rewritten"""
+    return TrendStore(TREND_DIR).rollups(window)
+
+def get_trend_rollups(window=30):
+    """Rolling trend aggregates over `window` days if postings have been collected (see src/trend_store.py), else None"""
+    directory = TrendStore(TREND_DIR).rollup_dir(window)
+    if not os.path.isdir(directory):
+        return None
+    return load_trend_rollups(window, os.path.getmtime(directory))
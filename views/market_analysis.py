@@ -0,0 +1,165 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from views.common import EXPERIENCE_ORDER, fragment
+from views.data import (
+    get_trend_rollups,
+    market_box_stats,
+    market_role_means,
+    market_salary_histogram,
+    market_skill_counts,
+)
+
+
+def render():
+    st.markdown("### Market Insights & Salary Trends")
+
+    # Top paying roles
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("💰 Top Paying Roles")
+        top_roles = market_role_means().sort_values(ascending=False).head(10)
+        fig_top = px.bar(
+            x=top_roles.values,
+            y=top_roles.index,
+            orientation='h',
+            title="Top 10 Highest Paying Roles",
+            labels={'x': 'Average Salary (LPA)', 'y': 'Job Role'},
+            color=top_roles.values,
+            color_continuous_scale="Reds"
+        )
+        st.plotly_chart(fig_top, use_container_width=True)
+
+    with col2:
+        st.subheader("📊 Most In-Demand Skills")
+        skill_stats = market_skill_counts()
+        top_skills_market = skill_stats.most_common(10)
+        skills_df = pd.DataFrame(top_skills_market, columns=['Skill', 'Demand'])
+
+        fig_skills_market = px.bar(
+            skills_df,
+            x='Demand',
+            y='Skill',
+            orientation='h',
+            title="Top 10 In-Demand Skills",
+            color='Demand',
+            color_continuous_scale="Purples"
+        )
+        st.plotly_chart(fig_skills_market, use_container_width=True)
+
+    st.divider()
+
+    # Salary distribution
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📉 Overall Salary Distribution")
+        salary_hist = market_salary_histogram()
+        fig_dist = go.Figure(go.Bar(
+            x=(salary_hist['bin_start'] + salary_hist['bin_end']) / 2,
+            y=salary_hist['count'],
+            width=salary_hist['bin_end'] - salary_hist['bin_start'],
+            marker_color='#636EFA'
+        ))
+        fig_dist.update_layout(
+            title="Salary Distribution Across All Roles",
+            xaxis_title="Salary (LPA)",
+            yaxis_title="Number of Jobs",
+            bargap=0
+        )
+        st.plotly_chart(fig_dist, use_container_width=True)
+
+    with col2:
+        st.subheader("📊 Experience vs Salary")
+        box_stats = market_box_stats(EXPERIENCE_ORDER)
+
+        fig_box = go.Figure()
+        for stats in box_stats:
+            fig_box.add_trace(go.Box(
+                x=[stats['experience']],
+                q1=[stats['q1']],
+                median=[stats['median']],
+                q3=[stats['q3']],
+                lowerfence=[stats['lowerfence']],
+                upperfence=[stats['upperfence']],
+                mean=[stats['mean']],
+                name=stats['experience']
+            ))
+            if stats['outliers']:
+                fig_box.add_trace(go.Scatter(
+                    x=[stats['experience']] * len(stats['outliers']),
+                    y=stats['outliers'],
+                    mode='markers',
+                    marker=dict(size=4, color='rgba(0, 0, 0, 0.4)'),
+                    name=f"{stats['experience']} outliers",
+                    showlegend=False
+                ))
+
+        fig_box.update_layout(
+            title="Salary Range by Experience Level",
+            yaxis_title="Salary (LPA)",
+            xaxis_title="Experience",
+            height=400
+        )
+        st.plotly_chart(fig_box, use_container_width=True)
+
+    rollups = get_trend_rollups()
+    if rollups is not None and not rollups.empty:
+        st.divider()
+        salary_trends()
+
+
+@fragment
+def salary_trends():
+    """Rolling salary/volume trend and skill growth; changing the pickers reruns only this fragment"""
+    st.subheader("📈 Salary Trends")
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        window = st.radio("Rolling window (days):", [7, 30, 90], index=1, horizontal=True, key="trend_window")
+    # Only the chosen window's rollups are read
+    windowed = get_trend_rollups(window)
+    with col1:
+        roles = sorted(windowed.loc[(windowed['kind'] == 'role') & (windowed['name'] != '*'), 'name'].unique())
+        role = st.selectbox("Role:", ["All roles"] + roles, key="trend_role")
+
+    name = '*' if role == "All roles" else role
+    series = windowed[(windowed['kind'] == 'role') & (windowed['name'] == name)]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_median = px.line(
+            series,
+            x='date',
+            y='median_salary',
+            title=f"{window}-Day Rolling Median Salary",
+            labels={'date': 'Date', 'median_salary': 'Median Salary (LPA)'}
+        )
+        st.plotly_chart(fig_median, use_container_width=True)
+    with col2:
+        fig_volume = px.area(
+            series,
+            x='date',
+            y='postings',
+            title=f"Postings in the Last {window} Days",
+            labels={'date': 'Date', 'postings': 'Postings'}
+        )
+        st.plotly_chart(fig_volume, use_container_width=True)
+
+    latest = windowed[(windowed['kind'] == 'skill') & (windowed['date'] == windowed['date'].max())]
+    growing = latest.dropna(subset=['growth']).sort_values('growth', ascending=False).head(10)
+    if not growing.empty:
+        fig_growth = px.bar(
+            growing,
+            x='growth',
+            y='name',
+            orientation='h',
+            title=f"Fastest Growing Skills (vs. previous {window} days)",
+            labels={'growth': 'Growth', 'name': 'Skill'},
+            color='growth',
+            color_continuous_scale="Tealgrn"
+        )
+        fig_growth.update_layout(xaxis_tickformat='.0%')
+        st.plotly_chart(fig_growth, use_container_width=True)
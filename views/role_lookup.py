@@ -0,0 +1,161 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from src.instrumentation import span
+from views.common import JOB_PORTALS, ROLE_TO_COMPANIES, fragment, portal_search_links
+from views.data import get_experience_levels, get_role_summary, get_unique_roles
+
+
+def render():
+    st.markdown("### Lookup Skills & Salary for Your Target Role")
+    role_lookup()
+
+
+@fragment
+def role_lookup():
+    """Role/experience pickers and results; changing them reruns only this fragment"""
+    col1, col2, col3 = st.columns([2, 2, 1])
+
+    with col1:
+        selected_role = st.selectbox(
+            "🏢 Select Job Role:",
+            get_unique_roles(),
+            placeholder="Choose a role...",
+            key="role_select"
+        )
+
+    with col2:
+        selected_exp = st.selectbox(
+            "📅 Experience Level:",
+            ["All"] + get_experience_levels(),
+            placeholder="All levels",
+            key="exp_select"
+        )
+
+    with col3:
+        search_btn = st.button("🔎 Search", use_container_width=True, type="primary")
+
+    if search_btn or selected_role:
+        if selected_role:
+            with span("page.role_lookup.results"):
+                show_role(selected_role, selected_exp)
+        else:
+            st.warning("⚠️ Please select a role to view details")
+
+
+def skills_figure(summary):
+    """Skill bar chart"""
+    skills_df = pd.DataFrame(summary['top_skills'], columns=["Skill", "Frequency"])
+    fig_skills = px.bar(
+        skills_df,
+        x="Frequency",
+        y="Skill",
+        orientation="h",
+        color="Frequency",
+        color_continuous_scale="Blues",
+        title="Top Skills Required"
+    )
+    fig_skills.update_layout(height=300, showlegend=False)
+    return fig_skills
+
+
+def experience_figure(summary):
+    """Average salary per experience level"""
+    return px.bar(
+        summary['exp_salary'],
+        x='experience',
+        y='mean',
+        title="Average Salary by Experience Level",
+        labels={'experience': 'Experience Level', 'mean': 'Average Salary (LPA)'},
+        color='mean',
+        color_continuous_scale="Greens"
+    )
+
+
+def show_role(selected_role, selected_exp):
+    summary = get_role_summary(selected_role, selected_exp)
+    if summary is None:
+        st.error("❌ No data found for this role and experience level")
+        return
+
+    avg_salary = summary['avg_salary']
+    min_salary = summary['min_salary']
+    max_salary = summary['max_salary']
+    median_salary = summary['median_salary']
+
+    # Display role header
+    st.success(f"### {selected_role}")
+
+    # Salary metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("💰 Average", f"₹{avg_salary:.2f}L", f"Median: ₹{median_salary:.2f}L")
+    with col2:
+        st.metric("📊 Min Salary", f"₹{min_salary:.2f}L")
+    with col3:
+        st.metric("📈 Max Salary", f"₹{max_salary:.2f}L")
+    with col4:
+        salary_range = max_salary - min_salary
+        st.metric("📉 Range", f"₹{salary_range:.2f}L")
+    with col5:
+        st.metric("📋 Records", summary['total_records'])
+
+    st.divider()
+
+    # Skills & Certifications
+    col_skills, col_certs = st.columns(2)
+
+    with col_skills:
+        st.subheader("🛠️ Required Skills")
+        st.plotly_chart(skills_figure(summary), use_container_width=True)
+
+    with col_certs:
+        st.subheader("🎓 Recommended Certifications")
+        certs = summary['certifications']
+        if len(certs) > 0:
+            cert_list = certs[:8]
+            st.info(f"**Certifications:**\n\n" + "\n".join([f"✅ {c}" for c in cert_list]))
+        else:
+            st.info("No specific certifications found for this role")
+
+    st.divider()
+
+    # Job Portals & Hiring Companies
+    st.subheader("🎯 Where to Apply - Job Portals & Hiring Companies")
+
+    job_col1, job_col2 = st.columns(2)
+
+    with job_col1:
+        st.markdown("#### 🌐 Popular Job Portals")
+        for portal_key, portal_info in JOB_PORTALS.items():
+            st.markdown(
+                f"[{portal_info['icon']} {portal_info['name']}]({portal_info['url']})",
+                unsafe_allow_html=False
+            )
+
+    with job_col2:
+        st.markdown("#### 🏢 Companies Hiring for This Role")
+        companies = ROLE_TO_COMPANIES.get(selected_role, ["Glassdoor", "LinkedIn", "Indeed"])
+        companies_text = ", ".join(companies[:6])
+        st.success(f"**{companies_text}** and many more!")
+
+        # Direct search links for job portals
+        st.markdown("#### 🔎 Quick Search Links")
+        for col_search, (label, url) in zip(st.columns(3), portal_search_links(selected_role)):
+            with col_search:
+                st.markdown(f"[{label}]({url})")
+
+    st.divider()
+    st.subheader("💼 Salary Distribution by Experience")
+    st.plotly_chart(experience_figure(summary), use_container_width=True)
+
+    st.divider()
+
+    # Sample records table
+    st.subheader("📋 Sample Job Records")
+    st.dataframe(
+        summary['sample_records'],
+        use_container_width=True,
+        hide_index=True
+    )